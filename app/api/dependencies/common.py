@@ -2,7 +2,7 @@
 
 from app.clients import IpstackClient
 from typing import Callable, Type, TypeVar
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repositories.base import SQLAlchemyRepository
@@ -24,6 +24,9 @@ def get_repository_dependency(
     return get_repo
 
 
-def ipstack_client_dependency() -> IpstackClient:
-    """Ipstack client dependency."""
-    return IpstackClient()
+def ipstack_client_dependency(request: Request) -> IpstackClient:
+    """Ipstack client dependency reusing http client pool and limits owned by the app."""
+    return IpstackClient(
+        http_client=getattr(request.app.state, "ipstack_http_client", None),
+        throttle=getattr(request.app.state, "ipstack_throttle", None),
+    )
@@ -0,0 +1,39 @@
+"""Module containing administrative endpoints."""
+
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.importer import ImportFormat, ImportReport, import_geolocations
+
+router = APIRouter()
+
+
+@router.post(
+    "/geolocation/import",
+    response_model=ImportReport,
+    name="import_geolocations_to_database",
+    status_code=status.HTTP_200_OK,
+)
+async def import_geolocations_dump(
+    request: Request,
+    import_format: ImportFormat = Query(
+        default=ImportFormat.NDJSON, alias="format", description="Format of body"
+    ),
+    update_existing: bool = Query(
+        default=False, description="Overwrite already stored geolocations"
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> ImportReport:
+    """Import geolocation dump streamed in request body as NDJSON or CSV.
+
+    Records are stored without ipstack lookups, invalid ones are rejected.
+    """
+    return await import_geolocations(
+        ip_geolocation_repo,
+        request.stream(),
+        import_format,
+        update_existing=update_existing,
+    )
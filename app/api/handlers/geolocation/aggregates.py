@@ -0,0 +1,63 @@
+"""Module containing geolocation aggregates endpoint."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from pydantic import BaseModel, ConfigDict
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.rollup import (
+    IPGeolocationRollupRepository,
+    RollupDimension,
+)
+
+router = APIRouter()
+
+
+class GeolocationGroup(BaseModel):
+    """Number of stored geolocations in a single group."""
+
+    key: str
+    name: str | None
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GeolocationAggregatesResponse(BaseModel):
+    """Response model for geolocation aggregates endpoint."""
+
+    dimension: RollupDimension
+    groups: list[GeolocationGroup]
+
+
+@router.get(
+    "/geolocation/aggregates",
+    response_model=GeolocationAggregatesResponse,
+    name="get_geolocation_aggregates_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocation_aggregates(
+    dimension: RollupDimension = Query(
+        default=RollupDimension.COUNTRY, description="Group geolocations by"
+    ),
+    limit: Optional[int] = Query(
+        default=100, ge=1, le=1000, description="Limit the number of groups returned"
+    ),
+    rollup_repo: IPGeolocationRollupRepository = Depends(
+        get_repository_dependency(IPGeolocationRollupRepository)
+    ),
+) -> GeolocationAggregatesResponse:
+    """Get number of stored geolocations per group, largest groups first.
+
+    Served from incrementally maintained rollups, cost does not depend on
+    number of stored geolocations. Geolocations without the grouped attribute
+    are counted under empty key. Cities are keyed by country code and city
+    name, e.g. 'US/Paris'.
+    """
+    groups = await rollup_repo.list(dimension, limit=limit)
+
+    return GeolocationAggregatesResponse(
+        dimension=dimension,
+        groups=[GeolocationGroup.model_validate(group) for group in groups],
+    )
@@ -0,0 +1,134 @@
+"""Module containing geolocations in area (radius and bounding box) endpoints."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from loguru import logger
+from pydantic import BaseModel
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.geo import Box, haversine_km, radius_boxes, split_antimeridian
+from app.models.models import IPGeolocationInDB
+
+router = APIRouter()
+
+
+class IPGeolocationWithDistance(IPGeolocationInDB):
+    """Schema for 'IPGeolocation' with distance from queried point."""
+
+    distance_km: float
+
+
+class AreaGeolocationsResponse(BaseModel):
+    """Response model for geolocations in area endpoints."""
+
+    items: list[IPGeolocationWithDistance]
+    total: int
+    offset: int
+    limit: int
+
+
+async def get_geolocations_by_distance(
+    ip_geolocation_repo: IPGeolocationRepository,
+    boxes: list[Box],
+    latitude: float,
+    longitude: float,
+    offset: int,
+    limit: int,
+    radius_km: float | None = None,
+) -> AreaGeolocationsResponse:
+    """Get page of geolocations in boxes ordered by distance from a point."""
+    rows = await ip_geolocation_repo.list_by_distance(
+        boxes, latitude, longitude, offset=offset, limit=limit, radius_km=radius_km
+    )
+    total = await ip_geolocation_repo.count_in_area(
+        boxes, latitude, longitude, radius_km=radius_km
+    )
+
+    return AreaGeolocationsResponse(
+        items=[
+            IPGeolocationWithDistance(
+                **row,
+                distance_km=haversine_km(
+                    latitude, longitude, row["latitude"], row["longitude"]
+                ),
+            )
+            for row in rows
+        ],
+        total=total,
+        offset=offset,
+        limit=limit,
+    )
+
+
+@router.get(
+    "/geolocation/nearby",
+    response_model=AreaGeolocationsResponse,
+    name="get_geolocations_nearby_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocations_nearby(
+    latitude: float = Query(ge=-90, le=90),
+    longitude: float = Query(ge=-180, le=180),
+    radius_km: float = Query(gt=0, le=20_100, description="Search radius in km"),
+    offset: Optional[int] = Query(default=0, ge=0, description="Skip N records"),
+    limit: Optional[int] = Query(
+        default=10, ge=1, le=100, description="Limit the number of records returned"
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> AreaGeolocationsResponse:
+    """Get geolocations within 'radius_km' of a point, nearest first."""
+    return await get_geolocations_by_distance(
+        ip_geolocation_repo,
+        radius_boxes(latitude, longitude, radius_km),
+        latitude,
+        longitude,
+        offset,
+        limit,
+        radius_km=radius_km,
+    )
+
+
+@router.get(
+    "/geolocation/box",
+    response_model=AreaGeolocationsResponse,
+    name="get_geolocations_in_box_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocations_in_box(
+    south: float = Query(ge=-90, le=90),
+    west: float = Query(ge=-180, le=180),
+    north: float = Query(ge=-90, le=90),
+    east: float = Query(ge=-180, le=180),
+    offset: Optional[int] = Query(default=0, ge=0, description="Skip N records"),
+    limit: Optional[int] = Query(
+        default=10, ge=1, le=100, description="Limit the number of records returned"
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> AreaGeolocationsResponse:
+    """Get geolocations inside bounding box, nearest to its center first.
+
+    Box with 'west' greater than 'east' crosses the antimeridian.
+    """
+    if south > north:
+        logger.error("Invalid bounding box: south {} > north {}", south, north)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'south' cannot be greater than 'north'",
+        )
+
+    center_longitude = (west + east) / 2 if west <= east else (west + east) / 2 + 180
+    center_longitude = (center_longitude + 180) % 360 - 180
+    return await get_geolocations_by_distance(
+        ip_geolocation_repo,
+        split_antimeridian((south, west, north, east)),
+        (south + north) / 2,
+        center_longitude,
+        offset,
+        limit,
+    )
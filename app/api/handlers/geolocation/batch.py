@@ -0,0 +1,86 @@
+"""Module containing batch geolocation read endpoints."""
+
+from ipaddress import IPv4Address as ip_address_validator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationInDB
+from config.settings import settings
+
+router = APIRouter()
+
+
+class BatchIPAddressRequest(BaseModel):
+    """Request model for batch get geolocations endpoint."""
+
+    ip_addresses: list[str] = Field(
+        min_length=1, max_length=settings.geolocation_batch_max_ips
+    )
+
+
+class BatchGeolocationResponse(BaseModel):
+    """Response model for batch get geolocations endpoints."""
+
+    items: list[IPGeolocationInDB]
+    missing: list[str]
+
+
+async def get_geolocations_batch(
+    ip_addresses: list[str], ip_geolocation_repo: IPGeolocationRepository
+) -> BatchGeolocationResponse:
+    """Get stored geolocations of given ip addresses in one database round-trip."""
+    validated_ip_addresses = []
+    for ip_address in ip_addresses:
+        try:
+            validated_ip_addresses.append(str(ip_address_validator(ip_address)))
+        except ValueError:
+            logger.error("Invalid IP address: '{}'", ip_address)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid IP address: '{ip_address}'",
+            )
+
+    records, missing = await ip_geolocation_repo.get_by_ips(validated_ip_addresses)
+
+    return BatchGeolocationResponse(items=list(records.values()), missing=missing)
+
+
+@router.get(
+    "/geolocation/batch",
+    response_model=BatchGeolocationResponse,
+    name="get_geolocations_batch_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocations_batch_by_query(
+    ip_addresses: list[str] = Query(
+        min_length=1, max_length=settings.geolocation_batch_max_ips
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> BatchGeolocationResponse:
+    """Get geolocations of ip addresses passed as repeated query parameter."""
+    return await get_geolocations_batch(ip_addresses, ip_geolocation_repo)
+
+
+@router.post(
+    "/geolocation/batch",
+    response_model=BatchGeolocationResponse,
+    name="get_geolocations_batch_from_database_by_body",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocations_batch_by_body(
+    request: BatchIPAddressRequest,
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> BatchGeolocationResponse:
+    """Get geolocations of ip addresses passed in request body.
+
+    Read only counterpart of the bulk endpoint, nothing is added to database.
+    """
+    return await get_geolocations_batch(request.ip_addresses, ip_geolocation_repo)
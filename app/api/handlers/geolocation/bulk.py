@@ -0,0 +1,131 @@
+"""Module containing bulk geolocation lookup endpoint."""
+
+from ipaddress import IPv4Address as ip_address_validator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, status
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.api.dependencies.common import (
+    get_repository_dependency,
+    ipstack_client_dependency,
+)
+from app.clients import IpstackClient
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.geolocation import store_missing_geolocations
+from app.models.models import IPGeolocationInDB
+from config.settings import settings
+
+router = APIRouter()
+
+
+class BulkIPAddressRequest(BaseModel):
+    """Request model for bulk add geolocations endpoint."""
+
+    ip_addresses: list[str] = Field(
+        min_length=1, max_length=settings.geolocation_bulk_max_ips
+    )
+
+
+class BulkGeolocationResult(BaseModel):
+    """Outcome of resolving geolocation of a single ip address."""
+
+    ip_address: str
+    status: Literal["found", "created", "error"]
+    data: IPGeolocationInDB | None = None
+    error: str | None = None
+
+
+class BulkGeolocationResponse(BaseModel):
+    """Response model for bulk add geolocations endpoint."""
+
+    results: list[BulkGeolocationResult]
+
+
+@router.post(
+    "/geolocation/bulk",
+    response_model=BulkGeolocationResponse,
+    name="bulk_add_geolocations_to_database",
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_add_geolocations(
+    request: BulkIPAddressRequest,
+    ipstack_client: IpstackClient = Depends(ipstack_client_dependency),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> BulkGeolocationResponse:
+    """Get geolocations of many ip addresses, adding missing ones to database.
+
+    Stored geolocations are loaded with one query, missing ones are resolved
+    and inserted by 'store_missing_geolocations'.
+    """
+    validated_ip_addresses, errors = {}, {}
+    for ip_address in request.ip_addresses:
+        try:
+            validated_ip_addresses[ip_address] = str(ip_address_validator(ip_address))
+        except ValueError:
+            errors[ip_address] = f"Invalid IP address: '{ip_address}'"
+
+    unique_ip_addresses = list(dict.fromkeys(validated_ip_addresses.values()))
+    # validated before storing missing ones, whose commit expires loaded records
+    found_records = {
+        record.ip: IPGeolocationInDB.model_validate(record)
+        for record in await ip_geolocation_repo.get_many_by_ip(unique_ip_addresses)
+    }
+
+    missing_ip_addresses = [
+        ip_address
+        for ip_address in unique_ip_addresses
+        if ip_address not in found_records
+    ]
+    created_records = {}
+    if missing_ip_addresses:
+        (
+            created_records,
+            stored_records,
+            store_errors,
+        ) = await store_missing_geolocations(
+            missing_ip_addresses, ipstack_client, ip_geolocation_repo
+        )
+        found_records.update(stored_records)
+        errors.update(store_errors)
+
+    results = []
+    for ip_address in request.ip_addresses:
+        validated_ip_address = validated_ip_addresses.get(ip_address)
+        if validated_ip_address in found_records:
+            results.append(
+                BulkGeolocationResult(
+                    ip_address=ip_address,
+                    status="found",
+                    data=IPGeolocationInDB.model_validate(
+                        found_records[validated_ip_address]
+                    ),
+                )
+            )
+        elif validated_ip_address in created_records:
+            results.append(
+                BulkGeolocationResult(
+                    ip_address=ip_address,
+                    status="created",
+                    data=IPGeolocationInDB.model_validate(
+                        created_records[validated_ip_address]
+                    ),
+                )
+            )
+        else:
+            error = errors.get(ip_address) or errors.get(
+                validated_ip_address, "Geolocation could not be resolved."
+            )
+            logger.error(
+                "Bulk geolocation lookup failed for '{}': {}", ip_address, error
+            )
+            results.append(
+                BulkGeolocationResult(
+                    ip_address=ip_address, status="error", error=error
+                )
+            )
+
+    return BulkGeolocationResponse(results=results)
@@ -0,0 +1,86 @@
+"""Module containing bulk geolocation delete endpoints."""
+
+from ipaddress import IPv4Address as ip_address_validator
+from ipaddress import IPv4Network as ip_network_validator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from config.settings import settings
+
+router = APIRouter()
+
+
+class BulkDeleteIPAddressRequest(BaseModel):
+    """Request model for bulk delete geolocations endpoint."""
+
+    ip_addresses: list[str] = Field(
+        min_length=1, max_length=settings.geolocation_bulk_delete_max_ips
+    )
+
+
+class DeletedCountResponse(BaseModel):
+    """Response model reporting number of deleted geolocations."""
+
+    deleted: int
+
+
+@router.post(
+    "/geolocation/bulk-delete",
+    response_model=DeletedCountResponse,
+    name="bulk_delete_geolocations_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_delete_geolocations(
+    request: BulkDeleteIPAddressRequest,
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> DeletedCountResponse:
+    """Delete geolocations of many ip addresses with single statement."""
+    validated_ip_addresses = []
+    for ip_address in request.ip_addresses:
+        try:
+            validated_ip_addresses.append(str(ip_address_validator(ip_address)))
+        except ValueError:
+            logger.error("Invalid IP address: '{}'", ip_address)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid IP address: '{ip_address}'",
+            )
+
+    deleted_ip_addresses = await ip_geolocation_repo.delete_many(
+        list(dict.fromkeys(validated_ip_addresses))
+    )
+
+    return DeletedCountResponse(deleted=len(deleted_ip_addresses))
+
+
+@router.delete(
+    "/geolocation/range",
+    response_model=DeletedCountResponse,
+    name="delete_geolocations_range_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def delete_geolocations_range(
+    cidr: str,
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> DeletedCountResponse:
+    """Delete all geolocations with ip inside CIDR range, e.g. '10.0.0.0/8'."""
+    try:
+        network = ip_network_validator(cidr)
+    except ValueError:
+        logger.error("Invalid CIDR range: '{}'", cidr)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CIDR range: '{cidr}'",
+        )
+
+    deleted_ip_addresses = await ip_geolocation_repo.delete_in_network(network)
+
+    return DeletedCountResponse(deleted=len(deleted_ip_addresses))
@@ -0,0 +1,80 @@
+"""Module containing geolocations export endpoint."""
+
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationInDB
+from config.settings import settings
+
+router = APIRouter()
+
+
+class ExportFormat(str, Enum):
+    """Enum representing supported export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+async def export_rows(
+    ip_geolocation_repo: IPGeolocationRepository, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Yield serialized geolocations, one chunk per database batch."""
+    try:
+        if export_format is ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=IPGeolocationInDB.model_fields)
+            writer.writeheader()
+            yield buffer.getvalue()
+
+        async for rows in ip_geolocation_repo.stream(
+            batch_size=settings.geolocation_export_batch_size
+        ):
+            records = [IPGeolocationInDB.model_validate(row) for row in rows]
+            if export_format is ExportFormat.CSV:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(record.model_dump(mode="json") for record in records)
+                yield buffer.getvalue()
+            else:
+                yield "".join(f"{record.model_dump_json()}\n" for record in records)
+    finally:
+        # session outlives request dependencies while the response is streamed
+        await ip_geolocation_repo.db.close()
+
+
+@router.get(
+    "/geolocation/export",
+    response_class=StreamingResponse,
+    name="export_geolocations_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def export_geolocations(
+    export_format: ExportFormat = Query(
+        default=ExportFormat.NDJSON, alias="format", description="Export format"
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> StreamingResponse:
+    """Stream all geolocations stored in database as NDJSON or CSV."""
+    return StreamingResponse(
+        export_rows(ip_geolocation_repo, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=geolocations.{export_format.value}"
+        },
+    )
@@ -1,11 +1,13 @@
 """Module containing geolocation data endpoints."""
 
 from ipaddress import IPv4Address as ip_address_validator
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
 from app.clients import IpstackClient
+from app.concurrency import geolocation_lookups
+from app.jobs import QueueFullError, enrichment_queue
+from app.api.handlers.geolocation.jobs import EnrichmentJobStatus
+from app.lookup import ip_range_lookup
 from loguru import logger
 from app.db.repositories.geolocation import IPGeolocationRepository
 from app.api.dependencies.common import (
@@ -13,6 +15,7 @@ from app.api.dependencies.common import (
     get_repository_dependency,
 )
 from app.models.models import IPGeolocationCreate, IPGeolocationInDB
+from app.responses import PydanticJSONResponse
 
 router = APIRouter()
 
@@ -23,6 +26,13 @@ class IPAddressRequest(BaseModel):
     ip_address: str
 
 
+class ExistingGeolocationResponse(BaseModel):
+    """Response model for add geolocation endpoint when ip is already stored."""
+
+    message: str
+    data: IPGeolocationInDB
+
+
 @router.get(
     "/geolocation",
     response_model=IPGeolocationInDB,
@@ -34,12 +44,12 @@ async def get_geolocation(
     ip_geolocation_repo: IPGeolocationRepository = Depends(
         get_repository_dependency(IPGeolocationRepository)
     ),
-) -> IPGeolocationInDB:
+) -> PydanticJSONResponse:
     """Get geolocation from database."""
     try:
         validated_ip_address = str(ip_address_validator(ip_address))
     except ValueError:
-        logger.error(f"Invalid IP address: '{ip_address}'")
+        logger.error("Invalid IP address: '{}'", ip_address)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid IP address: '{ip_address}'",
@@ -48,14 +58,14 @@ async def get_geolocation(
     existing_record = await ip_geolocation_repo.get_by_ip(validated_ip_address)
     if not existing_record:
         logger.warning(
-            f"Geolocation for IP '{validated_ip_address}' not found in database."
+            "Geolocation for IP '{}' not found in database.", validated_ip_address
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Geolocation for IP '{validated_ip_address}' not found in database.",
         )
 
-    return existing_record
+    return PydanticJSONResponse(existing_record)
 
 
 @router.post(
@@ -63,19 +73,33 @@ async def get_geolocation(
     response_model=IPGeolocationInDB,
     name="add_geolocation_to_database",
     status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_200_OK: {"model": ExistingGeolocationResponse},
+        status.HTTP_202_ACCEPTED: {"model": EnrichmentJobStatus},
+    },
 )
 async def add_geolocation(
     request: IPAddressRequest,
+    http_request: Request,
+    run_async: bool = Query(
+        default=False,
+        alias="async",
+        description="Queue lookup and return 202 with job id instead of waiting for it",
+    ),
     ipstack_client: IpstackClient = Depends(ipstack_client_dependency),
     ip_geolocation_repo: IPGeolocationRepository = Depends(
         get_repository_dependency(IPGeolocationRepository)
     ),
-) -> IPGeolocationInDB:
-    """Add geolocation to database."""
+) -> PydanticJSONResponse:
+    """Add geolocation to database.
+
+    With 'async' flag set, ip address is resolved and stored by background
+    workers, state of the job is reported by the url in 'Location' header.
+    """
     try:
         validated_ip_address = str(ip_address_validator(request.ip_address))
     except ValueError:
-        logger.error(f"Invalid IP address: '{request.ip_address}'")
+        logger.error("Invalid IP address: '{}'", request.ip_address)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid IP address: '{request.ip_address}'",
@@ -83,27 +107,53 @@ async def add_geolocation(
 
     existing_record = await ip_geolocation_repo.get_by_ip(validated_ip_address)
     if existing_record:
-        return JSONResponse(
+        return PydanticJSONResponse(
+            ExistingGeolocationResponse(
+                message=f"Geolocation for IP '{validated_ip_address}' already exists in database",
+                data=IPGeolocationInDB.model_validate(existing_record),
+            ),
             status_code=status.HTTP_200_OK,
-            content={
-                "message": f"Geolocation for IP '{validated_ip_address}' already exists in database",
-                "data": jsonable_encoder(
-                    IPGeolocationInDB.model_validate(existing_record)
-                ),
+        )
+
+    if run_async:
+        try:
+            job = enrichment_queue.submit(validated_ip_address)
+        except QueueFullError as e:
+            logger.error("{}", e)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many geolocations waiting to be added. Please try again later.",
+                headers={"Retry-After": "1"},
+            )
+        return PydanticJSONResponse(
+            EnrichmentJobStatus.from_job(job),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": str(
+                    http_request.url_for("get_geolocation_job", job_id=job.id)
+                )
             },
         )
 
-    try:
-        async with ipstack_client as client:
-            geolocation_response = await client.get_geolocation(validated_ip_address)
+    async def fetch_and_store_geolocation() -> IPGeolocationInDB:
+        # local ip range database first, ipstack only for ips it does not cover
+        geolocation_response = await ip_range_lookup.lookup(validated_ip_address)
+        if geolocation_response is None:
+            async with ipstack_client as client:
+                geolocation_response = await client.get_geolocation(
+                    validated_ip_address
+                )
 
-    except HTTPException:
-        raise
+        ip_geolocation_new = IPGeolocationCreate(**geolocation_response)
+        stored_record, _ = await ip_geolocation_repo.upsert(obj_new=ip_geolocation_new)
 
-    ip_geolocation_new = IPGeolocationCreate(**geolocation_response)
-    created_record = await ip_geolocation_repo.create(obj_new=ip_geolocation_new)
+        return IPGeolocationInDB.model_validate(stored_record)
 
-    return created_record
+    # Concurrent requests for the same IP share one ipstack call and one insert.
+    stored_geolocation = await geolocation_lookups.do(
+        validated_ip_address, fetch_and_store_geolocation
+    )
+    return PydanticJSONResponse(stored_geolocation, status_code=status.HTTP_201_CREATED)
 
 
 @router.delete(
@@ -121,7 +171,7 @@ async def delete_geolocation(
     try:
         validated_ip_address = str(ip_address_validator(ip_address))
     except ValueError:
-        logger.error(f"Invalid IP address: '{ip_address}'")
+        logger.error("Invalid IP address: '{}'", ip_address)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid IP address: '{ip_address}'",
@@ -130,7 +180,7 @@ async def delete_geolocation(
     deleted_record = await ip_geolocation_repo.delete(validated_ip_address)
     if not deleted_record:
         logger.warning(
-            f"Geolocation for IP '{validated_ip_address}' not found in database."
+            "Geolocation for IP '{}' not found in database.", validated_ip_address
         )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,80 @@
+"""Module containing geolocations in ip range endpoint."""
+
+from ipaddress import IPv4Address as ip_address_validator
+from ipaddress import IPv4Network as ip_network_validator
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from loguru import logger
+from pydantic import BaseModel
+
+from app.api.dependencies.common import get_repository_dependency
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationInDB
+
+router = APIRouter()
+
+
+class IPRangeResponse(BaseModel):
+    """Response model for geolocations in ip range endpoint."""
+
+    items: list[IPGeolocationInDB]
+    limit: int
+    next_cursor: str | None = None
+
+
+@router.get(
+    "/geolocation/range",
+    response_model=IPRangeResponse,
+    name="get_geolocations_range_from_database",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocations_range(
+    cidr: str,
+    limit: Optional[int] = Query(
+        default=10, ge=1, le=100, description="Limit the number of records returned"
+    ),
+    after: Optional[str] = Query(
+        default=None,
+        description="Return records after this ip ('next_cursor' of previous page)",
+    ),
+    ip_geolocation_repo: IPGeolocationRepository = Depends(
+        get_repository_dependency(IPGeolocationRepository)
+    ),
+) -> IPRangeResponse:
+    """Get geolocations with ip inside CIDR range, e.g. '10.0.0.0/8', by ip order."""
+    try:
+        network = ip_network_validator(cidr)
+    except ValueError:
+        logger.error("Invalid CIDR range: '{}'", cidr)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CIDR range: '{cidr}'",
+        )
+
+    after_ip = None
+    if after is not None:
+        try:
+            after_ip = str(ip_address_validator(after))
+        except ValueError:
+            logger.error("Invalid IP address: '{}'", after)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid IP address: '{after}'",
+            )
+
+    # fetch one extra record to find out whether there is a next page
+    records = await ip_geolocation_repo.list_in_network(
+        network, limit=limit + 1, after_ip=after_ip
+    )
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = records[-1].ip
+
+    return IPRangeResponse(
+        items=[IPGeolocationInDB.model_validate(record) for record in records],
+        limit=limit,
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,47 @@
+"""Module containing geolocation enrichment job endpoints."""
+
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+
+from app.jobs import EnrichmentJob, JobState, enrichment_queue
+from app.models.models import IPGeolocationInDB
+
+router = APIRouter()
+
+
+class EnrichmentJobStatus(BaseModel):
+    """Model containing state of a background enrichment job."""
+
+    job_id: str
+    ip_address: str
+    state: JobState
+    data: IPGeolocationInDB | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_job(cls, job: EnrichmentJob) -> "EnrichmentJobStatus":
+        return cls(
+            job_id=job.id,
+            ip_address=job.ip_address,
+            state=job.state,
+            data=job.data,
+            error=job.error,
+        )
+
+
+@router.get(
+    "/geolocation/jobs/{job_id}",
+    response_model=EnrichmentJobStatus,
+    name="get_geolocation_job",
+    status_code=status.HTTP_200_OK,
+)
+async def get_geolocation_job(job_id: str) -> EnrichmentJobStatus:
+    """Get state of a job started by adding geolocation with 'async' flag."""
+    job = enrichment_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found.",
+        )
+
+    return EnrichmentJobStatus.from_job(job)
@@ -1,20 +1,60 @@
 """Module containing list geolocations data endpoint."""
 
-from fastapi import APIRouter, Depends, status, Query
+import base64
+import binascii
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import Optional
+from typing_extensions import TypedDict
 from app.api.dependencies.common import get_repository_dependency
 from app.db.repositories.geolocation import IPGeolocationRepository
 from app.models.models import IPGeolocationInDB
-from pydantic import BaseModel
+from app.responses import PydanticJSONResponse
+from pydantic import BaseModel, TypeAdapter
 
 router = APIRouter()
 
 
 class PaginatedResponse(BaseModel):
     items: list[IPGeolocationInDB]
-    total: int
+    total: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+
+
+# Mirrors of the schemas above for plain rows, serialized without validation.
+IPGeolocationRow = TypedDict(
+    "IPGeolocationRow",
+    {name: field.annotation for name, field in IPGeolocationInDB.model_fields.items()},
+)
+
+
+class PaginatedRows(TypedDict):
+    items: list[IPGeolocationRow]
+    total: int | None
+    offset: int
+    limit: int
+    next_cursor: str | None
+
+
+paginated_rows_adapter = TypeAdapter(PaginatedRows)
+
+
+def encode_cursor(record_id: int) -> str:
+    """Encode id of the last record on a page into an opaque cursor."""
+    return base64.urlsafe_b64encode(str(record_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode opaque cursor into id of the last record on previous page."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: '{cursor}'",
+        )
 
 
 @router.get(
@@ -28,17 +68,50 @@ async def list_geolocations(
     limit: Optional[int] = Query(
         default=10, ge=1, le=100, description="Limit the number of records returned"
     ),
+    after: Optional[str] = Query(
+        default=None,
+        description="Return records after this cursor ('next_cursor' of previous page)",
+    ),
+    include_total: bool = Query(
+        default=True, description="Count all records, skip to make paging cheaper"
+    ),
     ip_geolocation_repo: IPGeolocationRepository = Depends(
         get_repository_dependency(IPGeolocationRepository)
     ),
-) -> PaginatedResponse:
-    """Get all geolocations from database."""
-    records = await ip_geolocation_repo.list(offset=offset, limit=limit)
-    total = await ip_geolocation_repo.count()
-
-    return PaginatedResponse(
-        items=[IPGeolocationInDB.model_validate(record) for record in records],
-        total=total,
-        offset=offset,
-        limit=limit,
+) -> PydanticJSONResponse:
+    """Get all geolocations from database.
+
+    Pages can be walked either by 'offset' or, much cheaper for deep pages,
+    by passing 'next_cursor' of the previous page as 'after'.
+    """
+    after_id = None
+    if after is not None:
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'offset' cannot be combined with 'after'",
+            )
+        after_id = decode_cursor(after)
+
+    # fetch one extra record to find out whether there is a next page
+    rows = await ip_geolocation_repo.list_rows(
+        offset=offset, limit=limit + 1, after_id=after_id
+    )
+    total = await ip_geolocation_repo.count() if include_total else None
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["id"])
+
+    # rows come straight from the database, they are dumped without validation
+    return PydanticJSONResponse(
+        PaginatedRows(
+            items=rows,
+            total=total,
+            offset=offset,
+            limit=limit,
+            next_cursor=next_cursor,
+        ),
+        adapter=paginated_rows_adapter,
     )
@@ -7,6 +7,30 @@ from app.api.handlers.geolocation.geolocation import (
 from app.api.handlers.geolocation.list import (
     router as list_geolocation_router,
 )
+from app.api.handlers.geolocation.bulk import (
+    router as bulk_geolocation_router,
+)
+from app.api.handlers.geolocation.batch import (
+    router as batch_geolocation_router,
+)
+from app.api.handlers.geolocation.export import (
+    router as export_geolocation_router,
+)
+from app.api.handlers.geolocation.bulk_delete import (
+    router as bulk_delete_geolocation_router,
+)
+from app.api.handlers.geolocation.ip_range import (
+    router as ip_range_geolocation_router,
+)
+from app.api.handlers.geolocation.area import (
+    router as area_geolocation_router,
+)
+from app.api.handlers.geolocation.aggregates import (
+    router as aggregates_geolocation_router,
+)
+from app.api.handlers.geolocation.jobs import (
+    router as jobs_geolocation_router,
+)
 
 
 def geolocation_api_router_factory() -> APIRouter:
@@ -16,6 +40,14 @@ def geolocation_api_router_factory() -> APIRouter:
     endpoint_routers = [
         add_get_delete_geolocation_router,
         list_geolocation_router,
+        bulk_geolocation_router,
+        batch_geolocation_router,
+        export_geolocation_router,
+        bulk_delete_geolocation_router,
+        ip_range_geolocation_router,
+        area_geolocation_router,
+        aggregates_geolocation_router,
+        jobs_geolocation_router,
     ]
 
     for endpoint_router in endpoint_routers:
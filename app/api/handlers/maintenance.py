@@ -2,10 +2,21 @@
 
 from time import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from pydantic import BaseModel
 
+from app.cache import geolocation_cache, geolocation_negative_cache
+from app.db.db_session import sessionmanager
+from app.metrics import (
+    cache_hit_ratio,
+    cache_size,
+    db_pool_checkout_timeouts,
+    db_pool_checkout_wait,
+    db_pool_connections,
+    render_metrics,
+)
+
 router = APIRouter()
 
 
@@ -20,3 +31,73 @@ class Pong(BaseModel):
 async def ping() -> Pong:
     """Return ok simply when server is available."""
     return Pong(message="pong", timestamp=time())
+
+
+class CacheStats(BaseModel):
+    """Model containing usage statistics of a single cache."""
+
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class CachesStats(BaseModel):
+    """Model containing usage statistics of in-process caches."""
+
+    geolocation: CacheStats
+    geolocation_not_found: CacheStats
+
+
+@router.get("/cache", name="cache_stats", response_model=CachesStats)
+async def cache_stats() -> CachesStats:
+    """Return hit/miss counters of in-process caches."""
+    return CachesStats(
+        geolocation=CacheStats(**geolocation_cache.stats()),
+        geolocation_not_found=CacheStats(**geolocation_negative_cache.stats()),
+    )
+
+
+class PoolStats(BaseModel):
+    """Model containing database connection pool usage statistics."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+
+
+@router.get("/pool", name="pool_stats", response_model=PoolStats)
+async def pool_stats() -> PoolStats:
+    """Return live connection pool usage and checkout wait statistics."""
+    return PoolStats(**sessionmanager.pool_stats())
+
+
+@router.get("/metrics", name="metrics", response_class=Response)
+async def metrics() -> Response:
+    """Return request, database and ipstack metrics in Prometheus text format."""
+    # point-in-time values are collected on scrape
+    for name, cache in (
+        ("geolocation", geolocation_cache),
+        ("geolocation_not_found", geolocation_negative_cache),
+    ):
+        stats = cache.stats()
+        cache_hit_ratio.set(name, value=stats["hit_ratio"])
+        cache_size.set(name, value=stats["size"])
+
+    stats = sessionmanager.pool_stats()
+    for state in ("checked_in", "checked_out", "overflow"):
+        db_pool_connections.set(state, value=stats[state])
+    db_pool_checkout_timeouts.set(value=stats["timeouts"])
+    db_pool_checkout_wait.set(value=stats["wait_seconds_total"])
+
+    return Response(
+        content=render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
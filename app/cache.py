@@ -0,0 +1,124 @@
+"""Module containing in-process caches."""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+
+from config.settings import settings
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry time to live and LRU eviction.
+
+    Meant to be used from a single event loop, operations never await so
+    no locking is needed. Size of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get cached value or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting least recently used entries when full."""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove key from cache."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Get cache usage statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedCounter:
+    """In-process counter seeded from an authoritative source.
+
+    Value is adjusted locally and treated as stale after 'resync_interval'
+    seconds, which bounds drift caused by writes of other processes.
+    """
+
+    def __init__(self, resync_interval: float) -> None:
+        self.resync_interval = resync_interval
+        self._value: int | None = None
+        self._synced_at = 0.0
+
+    def get(self) -> int | None:
+        """Get counter value or None when it has to be resynced."""
+        if self._value is None or monotonic() - self._synced_at >= self.resync_interval:
+            return None
+        return self._value
+
+    def set(self, value: int) -> None:
+        """Seed counter with authoritative value."""
+        self._value = value
+        self._synced_at = monotonic()
+
+    def add(self, delta: int) -> None:
+        """Adjust seeded counter by 'delta'."""
+        if self._value is not None:
+            self._value += delta
+
+    def clear(self) -> None:
+        """Drop counter value, forcing resync."""
+        self._value = None
+
+
+# Stored geolocations keyed by ip address.
+geolocation_cache = TTLCache(
+    maxsize=settings.geolocation_cache_size, ttl=settings.geolocation_cache_ttl
+)
+
+# Ip addresses not found in the database. Kept apart from 'geolocation_cache'
+# so a flood of distinct missing ips cannot evict stored geolocations.
+geolocation_negative_cache = TTLCache(
+    maxsize=settings.geolocation_negative_cache_size,
+    ttl=settings.geolocation_negative_cache_ttl,
+)
+
+# Number of stored geolocations, used by 'counter' count strategy.
+geolocation_counter = CachedCounter(
+    resync_interval=settings.geolocation_counter_resync_interval
+)
@@ -0,0 +1,94 @@
+"""Module containing command line entry points.
+
+Usage:
+    python -m app.cli import-geolocations dump.ndjson [--update-existing]
+    python -m app.cli rebuild-rollups
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from app.db.db_session import sessionmanager
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.db.repositories.rollup import IPGeolocationRollupRepository
+from app.importer import ImportFormat, ImportReport, import_geolocations
+from app.logging_config import configure_logging
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """Read file in binary chunks."""
+    with path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def import_geolocations_file(
+    path: Path, import_format: ImportFormat, update_existing: bool
+) -> ImportReport:
+    """Import geolocation dump file into database."""
+    try:
+        async with sessionmanager.session() as session:
+            return await import_geolocations(
+                IPGeolocationRepository(db=session),
+                read_chunks(path),
+                import_format,
+                update_existing=update_existing,
+            )
+    finally:
+        await sessionmanager.close()
+
+
+async def rebuild_rollups() -> int:
+    """Recompute geolocation aggregate rollups, repairing any drift."""
+    try:
+        async with sessionmanager.session() as session:
+            return await IPGeolocationRollupRepository(db=session).rebuild()
+    finally:
+        await sessionmanager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-geolocations", help="Bulk import geolocation dump (NDJSON or CSV)"
+    )
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument(
+        "--format",
+        type=ImportFormat,
+        choices=[import_format.value for import_format in ImportFormat],
+        help="Format of the dump, guessed from file extension by default",
+    )
+    import_parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="Overwrite already stored geolocations",
+    )
+
+    commands.add_parser(
+        "rebuild-rollups", help="Recompute geolocation aggregate rollups"
+    )
+
+    args = parser.parse_args()
+    configure_logging()
+    if args.command == "import-geolocations":
+        import_format = args.format or ImportFormat(
+            args.path.suffix.lstrip(".").lower()
+        )
+        report = asyncio.run(
+            import_geolocations_file(args.path, import_format, args.update_existing)
+        )
+        print(report.model_dump_json(indent=2))
+    elif args.command == "rebuild-rollups":
+        groups = asyncio.run(rebuild_rollups())
+        print(f"Rebuilt {groups} groups.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,229 @@
 """Module containing client classes."""
 
+import random
+from contextlib import asynccontextmanager
+from itertools import count
+from math import ceil
+from time import monotonic, perf_counter
+from typing import AsyncIterator
+
+import anyio
 import httpx
 from config.settings import settings
-from app.decorators import handle_ipstack_errors
+from app.concurrency import TokenBucket
+from app.decorators import ERROR_CODES_MAPPING, handle_ipstack_errors
+from app.metrics import ipstack_request_duration
 from fastapi import HTTPException, status
 from loguru import logger
 
+# ipstack error code of exhausted usage limit
+USAGE_LIMIT_ERROR = 104
+
+
+def create_ipstack_http_client() -> httpx.AsyncClient:
+    """Create pooled http client meant to be shared by all IpstackClient instances.
+
+    Keeping connections alive between requests saves DNS, TCP and TLS setup
+    on every geolocation lookup.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.ipstack_max_connections,
+            max_keepalive_connections=settings.ipstack_max_keepalive_connections,
+            keepalive_expiry=settings.ipstack_keepalive_expiry,
+        ),
+        http2=settings.ipstack_http2,
+        timeout=settings.ipstack_timeout,
+    )
+
+
+class IpstackThrottle:
+    """Limits of requests sent to ipstack, meant to be shared by all clients.
+
+    Each request waits for a free slot of 'max_concurrency' and then for a
+    token of the rate limit matching ipstack plan. Once ipstack reports
+    exhausted usage limit, requests fail fast for 'quota_cooldown' seconds
+    instead of being sent.
+    """
+
+    def __init__(
+        self,
+        rate: float = settings.ipstack_rate_limit,
+        burst: int = settings.ipstack_rate_burst,
+        max_concurrency: int = settings.ipstack_max_concurrency,
+        quota_cooldown: float = settings.ipstack_quota_cooldown,
+    ) -> None:
+        self.token_bucket = TokenBucket(rate, burst)
+        self.semaphore = anyio.Semaphore(max_concurrency)
+        self.quota_cooldown = quota_cooldown
+        self.quota_exhausted_until = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until request may be sent, hold concurrency slot while it runs."""
+        async with self.semaphore:
+            await self.token_bucket.acquire()
+            yield
+
+    def check_quota(self) -> None:
+        """Raise right away while usage limit is known to be exhausted."""
+        remaining = self.quota_exhausted_until - monotonic()
+        if remaining > 0:
+            status_code, detail = ERROR_CODES_MAPPING[USAGE_LIMIT_ERROR]
+            raise HTTPException(
+                status_code=status_code,
+                detail=detail,
+                headers={"Retry-After": str(ceil(remaining))},
+            )
+
+    def quota_exhausted(self) -> None:
+        """Stop sending requests until quota cooldown passes."""
+        if monotonic() >= self.quota_exhausted_until:
+            logger.error(
+                "IPStack usage limit reached, failing fast for {}s.",
+                self.quota_cooldown,
+            )
+        self.quota_exhausted_until = monotonic() + self.quota_cooldown
+
+
+def is_transient_error(error: httpx.HTTPError) -> bool:
+    """Check whether failed ipstack request is worth retrying."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code == status.HTTP_429_TOO_MANY_REQUESTS or status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter before retry number 'attempt' + 1."""
+    ceiling = min(
+        settings.ipstack_retry_backoff_max, settings.ipstack_retry_backoff * 2**attempt
+    )
+    return random.uniform(0, ceiling)
+
 
 class IpstackClient:
-    """Client for IPStack api."""
+    """Client for IPStack api.
+
+    When 'http_client' is given, its connection pool is reused and it is not
+    closed on context exit - the owner (application lifespan) closes it.
+    The same goes for 'throttle', without one given limits apply only to
+    requests of this client.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        throttle: IpstackThrottle | None = None,
+    ) -> None:
         self.api_key = settings.ipstack_access_key
         self.base_url = settings.ipstack_api_url
+        self.shared_client = http_client
+        self.throttle = throttle or IpstackThrottle()
         self.client = None
 
     async def __aenter__(self):
         """Asynchronous enter context."""
-        self.client = httpx.AsyncClient()
+        self.client = self.shared_client or httpx.AsyncClient()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Asynchronous exit context."""
-        if self.client:
+        if self.client and self.client is not self.shared_client:
             await self.client.aclose()
+        self.client = None
 
     @handle_ipstack_errors
     async def get_geolocation(self, ip_address: str) -> httpx.Response:
         """Get geolocation for given ip address."""
+        return await self._get(ip_address)
+
+    @handle_ipstack_errors
+    async def get_bulk_geolocation(self, ip_addresses: list[str]) -> list[dict]:
+        """Get geolocations of multiple ip addresses with single bulk request.
+
+        Ipstack accepts up to 50 comma separated addresses per bulk request.
+        """
+        data = await self._get(",".join(ip_addresses))
+        # a single address is answered with an object instead of a list
+        if isinstance(data, dict) and data.get("success", True):
+            return [data]
+        return data
+
+    async def _get(self, path: str):
+        """Send request to ipstack api, map transport errors to HTTPException.
+
+        Timeouts, connection errors and 429/5xx responses are retried with
+        exponential backoff. GET requests are idempotent, so a retry cannot
+        do any harm.
+        """
         if not self.client:
             raise RuntimeError("Client must be used within context manager")
 
-        try:
-            response = await self.client.get(
-                f"{self.base_url}/{ip_address}?access_key={self.api_key}",
-                timeout=settings.ipstack_timeout,
-            )
+        self.throttle.check_quota()
+        for attempt in count():
+            try:
+                data = await self._send(path)
+                break
+            except httpx.HTTPError as e:
+                if attempt >= settings.ipstack_max_retries or not is_transient_error(e):
+                    raise self._http_exception(e)
+                delay = retry_delay(attempt)
+                logger.warning(
+                    "IPStack API request failed: {!r}, retrying in {:.2f}s.", e, delay
+                )
+                await anyio.sleep(delay)
+            except Exception as e:
+                raise self._http_exception(e)
+
+        if (
+            isinstance(data, dict)
+            and data.get("error", {}).get("code") == USAGE_LIMIT_ERROR
+        ):
+            self.throttle.quota_exhausted()
+        return data
+
+    async def _send(self, path: str):
+        """Send single request within throttle limits and record its duration."""
+        async with self.throttle.slot():
+            started_at = perf_counter()
+            request_status = "error"
+            try:
+                response = await self.client.get(
+                    f"{self.base_url}/{path}?access_key={self.api_key}",
+                    timeout=settings.ipstack_timeout,
+                )
+                request_status = response.status_code
 
-            response.raise_for_status()
-            return response.json()
-        except httpx.TimeoutException:
+                response.raise_for_status()
+                return response.json()
+            except httpx.TimeoutException:
+                request_status = "timeout"
+                raise
+            finally:
+                ipstack_request_duration.observe(
+                    perf_counter() - started_at, request_status
+                )
+
+    @staticmethod
+    def _http_exception(error: Exception) -> HTTPException:
+        """Map error of the last request attempt to client facing exception."""
+        if isinstance(error, httpx.TimeoutException):
             logger.error("IPStack API request timed out.")
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_504_GATEWAY_TIMEOUT,
                 detail="Request timed out. Please try again later.",
             )
-        except httpx.HTTPStatusError as status_exc:
+        if isinstance(error, httpx.HTTPStatusError):
             logger.error(
-                f"IPStack API returned error status: {status_exc.response.status_code}"
+                "IPStack API returned error status: {}", error.response.status_code
             )
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Geolocation service is temporarily unavailable. Please try again later.",
             )
-        except Exception as e:
-            logger.error(f"Unexpected error in IPStack API request: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Unexpected error in IPStack API request: {e}",
-            )
+        logger.error("Unexpected error in IPStack API request: {}", error)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Unexpected error in IPStack API request: {error}",
+        )
@@ -0,0 +1,100 @@
+"""Module containing concurrency helpers."""
+
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import anyio
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call:
+    """In-flight call shared by all callers of the same key."""
+
+    done: anyio.Event = field(default_factory=anyio.Event)
+    result: Any = None
+    error: BaseException | None = None
+    cancelled: bool = False
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller of a key runs the function, callers arriving while it is
+    still in flight wait for it and receive the same result (or exception).
+    Works within a single process and event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether call for given key is currently running."""
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run 'func' once for all concurrent callers of 'key'."""
+        while (call := self._calls.get(key)) is not None:
+            await call.done.wait()
+            if call.cancelled:
+                # leader was cancelled, its outcome is not ours - try again
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        call = self._calls[key] = _Call()
+        try:
+            call.result = await func()
+            return call.result
+        except anyio.get_cancelled_exc_class():
+            call.cancelled = True
+            raise
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            del self._calls[key]
+            call.done.set()
+
+
+class TokenBucket:
+    """Rate limiter handing out 'rate' tokens per second, bursting up to 'capacity'.
+
+    Callers reserve a token right away and sleep until it is refilled, so
+    waiters are served in arrival order without any locking. Rate of 0
+    disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated_at = monotonic()
+
+    async def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        if self.rate <= 0:
+            return
+
+        now = monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        try:
+            await anyio.sleep(-self._tokens / self.rate)
+        except anyio.get_cancelled_exc_class():
+            # hand reserved token back to callers still waiting
+            self._tokens += 1
+            raise
+
+
+# Shared by endpoints resolving geolocation of a single IP address.
+geolocation_lookups = SingleFlight()
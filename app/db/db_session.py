@@ -1,8 +1,13 @@
 """Module containing database session configuration."""
 
 import contextlib
-from typing import Any, AsyncIterator
-from config.settings import settings
+from typing import Any, AsyncIterator, Sequence
+from uuid import uuid4
+
+from app.db.pool import InstrumentedPool
+from app.db.routing import ReplicaRouter, RoutingSession
+from app.metrics import instrument_engine
+from config.settings import ReplicaSelection, settings
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncSession,
@@ -12,16 +17,52 @@ from sqlalchemy.ext.asyncio import (
 
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    """Own database engines and sessions bound to them.
+
+    With 'replica_hosts' given, a replica engine is created for each host
+    and reads marked with 'use_replica' execution option are routed to
+    them, see 'ReplicaRouter'.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        replica_hosts: Sequence[str] = (),
+        replica_selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN,
+        read_your_writes_window: float = 0.0,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
-        self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
+        self._replica_engines = [
+            create_async_engine(replica_host, **engine_kwargs)
+            for replica_host in replica_hosts
+        ]
+        for engine in (self._engine, *self._replica_engines):
+            instrument_engine(engine.sync_engine)
+
+        self.router = ReplicaRouter(
+            primary=self._engine,
+            replicas=self._replica_engines,
+            selection=replica_selection,
+            read_your_writes_window=read_your_writes_window,
+        )
+        self._sessionmaker = async_sessionmaker(
+            autocommit=False, sync_session_class=RoutingSession, router=self.router
+        )
+
+    def pool_stats(self) -> dict[str, int | float]:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        return self._engine.pool.stats()
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
-        await self._engine.dispose()
+        for engine in (self._engine, *self._replica_engines):
+            await engine.dispose()
 
         self._engine = None
+        self._replica_engines = []
         self._sessionmaker = None
 
     @contextlib.asynccontextmanager
@@ -51,7 +92,36 @@ class DatabaseSessionManager:
             await session.close()
 
 
-sessionmanager = DatabaseSessionManager(settings.database_url, {"echo": True})
+def database_engine_options() -> dict[str, Any]:
+    """Build engine options of the configured engine profile."""
+    connect_args: dict[str, Any] = {
+        # sqlalchemy adapter cache and asyncpg connection cache
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size,
+    }
+    if settings.db_pgbouncer:
+        # statement names must not collide across server connections
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+    return {
+        "echo": settings.database_echo,
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "connect_args": connect_args,
+    }
+
+
+sessionmanager = DatabaseSessionManager(
+    settings.database_url,
+    database_engine_options(),
+    replica_hosts=settings.database_replica_urls,
+    replica_selection=settings.db_replica_selection,
+    read_your_writes_window=settings.db_read_your_writes_window,
+)
 
 
 async def get_db_session():
@@ -1,10 +1,18 @@
 """Module containing Sqlalchemy models."""
 
-from sqlalchemy import Column, Numeric, String
+from sqlalchemy import BigInteger, Column, Integer, Numeric, String, UniqueConstraint
 # from sqlalchemy.orm import relationship
 
 from app.db.models.base import Base, BaseDBModel
 from app.db.models.metadata import metadata_family
+from app.db.models.types import IPAddressType
+from app.geo import geohash
+
+
+def geohash_default(context) -> int | None:
+    """Compute geohash from latitude and longitude of inserted row."""
+    parameters = context.get_current_parameters()
+    return geohash(parameters.get("latitude"), parameters.get("longitude"))
 
 
 class IPGeolocation(Base, BaseDBModel):
@@ -12,7 +20,7 @@ class IPGeolocation(Base, BaseDBModel):
 
     __metadata__ = metadata_family
 
-    ip = Column(String, index=True, unique=True)
+    ip = Column(IPAddressType, index=True, unique=True)
     type = Column(String)
     continent_code = Column(String)
     continent_name = Column(String)
@@ -24,3 +32,21 @@ class IPGeolocation(Base, BaseDBModel):
     zip = Column(String)
     latitude = Column(Numeric(precision=16, scale=13))
     longitude = Column(Numeric(precision=16, scale=13))
+    # Z-order code of the location, derived from latitude and longitude
+    geohash = Column(BigInteger, index=True, default=geohash_default)
+
+
+class IPGeolocationRollup(Base, BaseDBModel):
+    """Database model representing number of geolocations per group.
+
+    Kept up to date by 'IPGeolocationRepository' writes, one row per group
+    of each dimension (e.g. dimension 'country', key 'US').
+    """
+
+    __metadata__ = metadata_family
+    __table_args__ = (UniqueConstraint("dimension", "key"),)
+
+    dimension = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    name = Column(String)
+    count = Column(Integer, nullable=False, default=0)
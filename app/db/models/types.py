@@ -0,0 +1,44 @@
+"""Module containing custom sqlalchemy column types."""
+
+from ipaddress import IPv6Address, ip_address
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+class IPAddressType(TypeDecorator):
+    """Ip address stored in its native binary form, exposed as string.
+
+    Postgres uses 'INET' column, other databases (sqlite in tests) store
+    16 byte big-endian key (ipv4 addresses are ipv4-mapped ipv6 ones), so
+    ordering and range comparisons follow numeric order of addresses.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.INET())
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+
+        address = ip_address(value)
+        if dialect.name == "postgresql":
+            return str(address)
+        if address.version == 4:
+            address = IPv6Address(f"::ffff:{address}")
+        return address.packed
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        if dialect.name == "postgresql":
+            return str(ip_address(str(value).split("/")[0]))
+        address = IPv6Address(bytes(value))
+        return str(address.ipv4_mapped or address)
@@ -1,10 +1,25 @@
 """Abstract CRUD Repo definitions."""
 
 from abc import ABC
-from typing import TypeVar
+from decimal import Decimal
+from ipaddress import IPv4Network
+from types import SimpleNamespace
+from typing import AsyncIterable, Sequence, TypeVar
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.base import Base
@@ -14,6 +29,12 @@ from app.models.base import BaseSchema
 SQLA_MODEL = TypeVar("SQLA_MODEL", bound=Base)
 CREATE_SCHEMA = TypeVar("CREATE_SCHEMA", bound=BaseSchema)
 
+# insert constructs supporting 'ON CONFLICT' clauses
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class SQLAlchemyRepository(ABC):
     """Abstract SQLAlchemy repo defining basic database operations.
@@ -30,18 +51,35 @@ class SQLAlchemyRepository(ABC):
 
     sqla_model = SQLA_MODEL
 
+    @property
+    def dialect_name(self) -> str:
+        """Name of the database dialect session is bound to."""
+        return self.db.get_bind().dialect.name
+
     create_schema = CREATE_SCHEMA
 
+    async def _before_commit(
+        self, inserted: Sequence = (), deleted: Sequence = ()
+    ) -> None:
+        """Hook run in the writing transaction right before it is committed.
+
+        Receives objects (or rows) stored and removed by the write, overwritten
+        object is passed as removed old and stored new version. Bulk imports
+        do not call it.
+        """
+
     async def create(self, obj_new: create_schema) -> sqla_model | None:
         """Commit new object to the database."""
         try:
             db_obj_new = self.sqla_model(**obj_new.model_dump())
             self.db.add(db_obj_new)
+            await self.db.flush()
+            await self._before_commit(inserted=[db_obj_new])
 
             await self.db.commit()
             await self.db.refresh(db_obj_new)
 
-            logger.success(f"Created new entity: {db_obj_new}.")
+            logger.success("Created new entity: {}.", db_obj_new)
 
             return db_obj_new
 
@@ -53,12 +91,265 @@ class SQLAlchemyRepository(ABC):
 
             return None
 
+    async def upsert(
+        self, obj_new: create_schema, update_existing: bool = False
+    ) -> tuple[sqla_model, bool]:
+        """Store object with single 'INSERT ... ON CONFLICT (ip) ... RETURNING'.
+
+        Object already stored under the same ip is overwritten when
+        'update_existing' is set, otherwise it is left untouched and returned
+        (which costs one extra query only in case of a conflict). Returns
+        stored object and whether it was inserted rather than already stored.
+
+        When 'update_existing' is set, the version about to be overwritten is
+        selected first, one extra query per call: 'RETURNING' only sees the
+        new version, while '_before_commit' needs the old one to take it out
+        of rollups, and its absence tells an insert from an update.
+        """
+        values = obj_new.model_dump()
+        query = (
+            self._merge_on_ip(
+                self.insert().values(**values), list(values), update_existing
+            )
+            .returning(self.sqla_model)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            previous = None
+            if update_existing:
+                result = await self.db.execute(
+                    select(self.sqla_model.__table__).where(
+                        self.sqla_model.ip == obj_new.ip
+                    )
+                )
+                previous = result.first()
+
+            result = await self.db.execute(query)
+            db_obj = result.scalar_one_or_none()
+            inserted = db_obj is not None and previous is None
+            if db_obj is None:
+                result = await self.db.execute(
+                    select(self.sqla_model).where(self.sqla_model.ip == obj_new.ip)
+                )
+                db_obj = result.scalar_one()
+            else:
+                await self._before_commit(
+                    inserted=[db_obj], deleted=[previous] if previous else []
+                )
+
+            # keep loaded attributes usable after commit expires session objects
+            self.db.expunge(db_obj)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        logger.success("Stored entity: {}.", db_obj)
+
+        return db_obj, inserted
+
+    def insert(self):
+        """Get dialect specific insert statement for repository model."""
+        return DIALECT_INSERTS.get(self.dialect_name, insert)(self.sqla_model)
+
+    async def create_many(self, objs_new: Sequence[create_schema]) -> list[sqla_model]:
+        """Insert new objects with single multi-row statement.
+
+        Objects conflicting with already stored ips are skipped, only
+        inserted objects are returned.
+        """
+        if not objs_new:
+            return []
+
+        query = (
+            self.insert()
+            .values(
+                [
+                    self._with_derived_values(obj_new.model_dump())
+                    for obj_new in objs_new
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["ip"])
+            .returning(self.sqla_model)
+        )
+        result = await self.db.execute(query)
+        db_objs_new = result.scalars().all()
+        await self._before_commit(inserted=db_objs_new)
+        # keep loaded attributes usable after commit expires session objects
+        for db_obj_new in db_objs_new:
+            self.db.expunge(db_obj_new)
+        await self.db.commit()
+
+        logger.success("Created {} new entities.", len(db_objs_new))
+
+        return list(db_objs_new)
+
+    async def bulk_import(
+        self,
+        batches: AsyncIterable[Sequence[create_schema]],
+        update_existing: bool = False,
+    ) -> tuple[int, int]:
+        """Import objects in a single transaction, merging them on ip.
+
+        On postgres batches are streamed into temporary staging table with
+        'COPY' and merged into model table with one 'INSERT ... SELECT'.
+        Other databases get one multi-row insert per batch. Stored objects
+        are skipped unless 'update_existing' is set.
+
+        Returns number of imported and number of stored (inserted or updated)
+        objects.
+        """
+        try:
+            if self.dialect_name == "postgresql":
+                imported, stored = await self._copy_import(batches, update_existing)
+            else:
+                imported, stored = await self._insert_import(batches, update_existing)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        logger.success("Imported {} entities, {} stored.", imported, stored)
+
+        return imported, stored
+
+    def _merge_on_ip(self, query, columns: Sequence[str], update_existing: bool):
+        """Add conflict handling on ip to dialect specific insert statement."""
+        if not update_existing:
+            return query.on_conflict_do_nothing(index_elements=["ip"])
+
+        return query.on_conflict_do_update(
+            index_elements=["ip"],
+            set_={
+                **{name: query.excluded[name] for name in columns if name != "ip"},
+                **{
+                    derived_column.name: query.excluded[derived_column.name]
+                    for derived_column in self.derived_columns
+                },
+                "updated_at": func.now(),
+            },
+        )
+
+    @property
+    def derived_columns(self) -> list[Column]:
+        """Columns with python defaults computed from other inserted values."""
+        return [
+            model_column
+            for model_column in self.sqla_model.__table__.columns
+            if model_column.default is not None and model_column.default.is_callable
+        ]
+
+    def _with_derived_values(self, values: dict) -> dict:
+        """Add values of derived columns.
+
+        Needed by multi-row 'VALUES' (context-sensitive defaults do not get
+        parameters of each row there), 'COPY' and 'INSERT ... SELECT'.
+        """
+        context = SimpleNamespace(get_current_parameters=lambda: values)
+        return {
+            **values,
+            **{
+                derived_column.name: derived_column.default.arg(context)
+                for derived_column in self.derived_columns
+            },
+        }
+
+    async def _insert_import(
+        self,
+        batches: AsyncIterable[Sequence[create_schema]],
+        update_existing: bool,
+    ) -> tuple[int, int]:
+        columns = list(self.create_schema.model_fields)
+        imported = stored = 0
+        async for batch in batches:
+            query = self.insert().values(
+                [self._with_derived_values(obj_new.model_dump()) for obj_new in batch]
+            )
+            result = await self.db.execute(
+                self._merge_on_ip(query, columns, update_existing)
+            )
+            imported += len(batch)
+            stored += result.rowcount
+
+        return imported, stored
+
+    async def _copy_import(
+        self,
+        batches: AsyncIterable[Sequence[create_schema]],
+        update_existing: bool,
+    ) -> tuple[int, int]:
+        # derived values are computed here and staged with the rest
+        columns = [
+            *self.create_schema.model_fields,
+            *(derived_column.name for derived_column in self.derived_columns),
+        ]
+        target_table = self.sqla_model.__table__
+        staging_table = table(
+            f"{target_table.name}_import", *[column(name) for name in columns]
+        )
+        quoted_columns = ", ".join(f'"{name}"' for name in columns)
+
+        connection = await self.db.connection()
+        # no constraints or defaults on staging table, rows are only validated on merge
+        await connection.execute(
+            text(
+                f'CREATE TEMPORARY TABLE "{staging_table.name}" ON COMMIT DROP AS '
+                f'SELECT {quoted_columns} FROM "{target_table.name}" WITH NO DATA'
+            )
+        )
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        imported = 0
+        async for batch in batches:
+            records = [
+                tuple(
+                    Decimal(str(value)) if isinstance(value, float) else value
+                    for value in self._with_derived_values(
+                        obj_new.model_dump()
+                    ).values()
+                )
+                for obj_new in batch
+            ]
+            await driver_connection.copy_records_to_table(
+                staging_table.name, records=records, columns=columns
+            )
+            imported += len(records)
+
+        # 'DISTINCT ON' keeps single row per ip, an insert cannot touch a row twice
+        query = self.insert().from_select(
+            columns,
+            select(*staging_table.columns).distinct(staging_table.c.ip),
+        )
+        result = await self.db.execute(
+            self._merge_on_ip(query, columns, update_existing)
+        )
+
+        return imported, result.rowcount
+
+    async def get_many_by_ip(self, ips: Sequence[str]) -> list[sqla_model]:
+        """Get objects stored for any of given ips with single query."""
+        if not ips:
+            return []
+
+        query = (
+            select(self.sqla_model)
+            .where(self.sqla_model.ip.in_(ips))
+            .execution_options(use_replica=True, replica_keys=ips)
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
     async def get_by_ip(
         self,
         ip: str,
     ) -> sqla_model | None:
         """Get object by ip or return None."""
-        query = select(self.sqla_model).where(self.sqla_model.ip == ip)
+        query = (
+            select(self.sqla_model)
+            .where(self.sqla_model.ip == ip)
+            .execution_options(use_replica=True, replica_keys=(ip,))
+        )
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
@@ -67,15 +358,70 @@ class SQLAlchemyRepository(ABC):
         ip: str,
     ) -> sqla_model | None:
         """Delete object from db by ip or None if object not found in db"""
-        query = select(self.sqla_model).where(self.sqla_model.ip == ip)
+        query = (
+            delete(self.sqla_model)
+            .where(self.sqla_model.ip == ip)
+            .returning(self.sqla_model)
+        )
         result = await self.db.execute(query)
         db_obj = result.scalar_one_or_none()
 
         if db_obj:
-            await self.db.delete(db_obj)
+            await self._before_commit(deleted=[db_obj])
+            # keep loaded attributes usable after commit expires session objects
+            self.db.expunge(db_obj)
             await self.db.commit()
-            logger.success(f"Entity: {db_obj} successfully deleted from database.")
+            logger.success("Entity: {} successfully deleted from database.", db_obj)
             return db_obj
 
-        logger.warning(f"Object with ip = {ip} not found in database")
+        logger.warning("Object with ip = {} not found in database", ip)
         return None
+
+    async def delete_many(self, ips: Sequence[str]) -> list[str]:
+        """Delete objects of given ips with single statement.
+
+        Returns ips of deleted objects.
+        """
+        if not ips:
+            return []
+
+        return await self._delete_where(self.sqla_model.ip.in_(ips))
+
+    async def delete_in_network(self, network: IPv4Network) -> list[str]:
+        """Delete objects with ip inside given network with single statement.
+
+        Returns ips of deleted objects.
+        """
+        return await self._delete_where(self.ip_in_network(network))
+
+    def ip_in_network(self, network: IPv4Network) -> ColumnElement[bool]:
+        """Build index friendly condition matching ips inside given network."""
+        if self.dialect_name == "postgresql":
+            return self.sqla_model.ip.op("<<=")(literal(str(network), postgresql.CIDR))
+
+        return self.sqla_model.ip.between(
+            str(network.network_address), str(network.broadcast_address)
+        )
+
+    async def _delete_where(self, condition: ColumnElement[bool]) -> list[str]:
+        query = (
+            delete(self.sqla_model)
+            .where(condition)
+            .returning(*self.sqla_model.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self.db.execute(query)
+            deleted_rows = result.all()
+            await self._before_commit(deleted=deleted_rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        deleted_ips = [row.ip for row in deleted_rows]
+        logger.success(
+            "{} entities successfully deleted from database.", len(deleted_ips)
+        )
+
+        return deleted_ips
@@ -1,9 +1,33 @@
 """Module containing domain repository for Geolocation entity."""
 
+from ipaddress import IPv4Network
+from math import cos, radians
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from app.cache import (
+    geolocation_cache,
+    geolocation_counter,
+    geolocation_negative_cache,
+)
 from app.db.models.models import IPGeolocation
 from app.db.repositories.base import SQLAlchemyRepository
-from app.models.models import IPGeolocationCreate
-from sqlalchemy import select, func
+from app.db.routing import mark_written
+from app.db.repositories.rollup import IPGeolocationRollupRepository
+from app.geo import Box, geohash_ranges, haversine_term_of_km
+from app.models.models import IPGeolocationCreate, IPGeolocationInDB
+from config.settings import CountStrategy, settings
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    RowMapping,
+    Select,
+    and_,
+    cast,
+    or_,
+    select,
+    func,
+    text,
+)
 
 
 class IPGeolocationRepository(SQLAlchemyRepository):
@@ -17,19 +41,369 @@ class IPGeolocationRepository(SQLAlchemyRepository):
 
     create_schema = IPGeolocationCreate
 
-    async def count(self) -> int:
-        """Get total count of records."""
-        query = select(func.count()).select_from(self.sqla_model)
+    async def _before_commit(
+        self, inserted: Sequence[IPGeolocation] = (), deleted: Sequence = ()
+    ) -> None:
+        """Adjust aggregate rollups in the same transaction as the write."""
+        mark_written(self.db, {row.ip for row in (*inserted, *deleted)})
+        await IPGeolocationRollupRepository(db=self.db).apply(inserted, deleted)
+
+    async def get_by_ip(self, ip: str) -> IPGeolocationInDB | None:
+        """Get geolocation by ip, served from in-memory caches when possible."""
+        cached_record = geolocation_cache.get(ip)
+        if cached_record is not None:
+            return cached_record
+
+        if geolocation_negative_cache.get(ip):
+            return None
+
+        record = await super().get_by_ip(ip)
+        if record is None:
+            geolocation_negative_cache.set(ip, True)
+            return None
+
+        record = IPGeolocationInDB.model_validate(record)
+        geolocation_cache.set(ip, record)
+        return record
+
+    async def get_by_ips(
+        self, ips: Sequence[str]
+    ) -> tuple[dict[str, IPGeolocationInDB], list[str]]:
+        """Get stored geolocations of many ips, in order, and report missing ones.
+
+        Cached geolocations are served from memory, all remaining ones are
+        loaded with a single query on the ip index.
+        """
+        unique_ips = list(dict.fromkeys(ips))
+        records, uncached_ips = {}, []
+        for ip in unique_ips:
+            cached_record = geolocation_cache.get(ip)
+            if cached_record is not None:
+                records[ip] = cached_record
+            elif not geolocation_negative_cache.get(ip):
+                uncached_ips.append(ip)
+
+        for record in await self.get_many_by_ip(uncached_ips):
+            record = IPGeolocationInDB.model_validate(record)
+            geolocation_cache.set(record.ip, record)
+            records[record.ip] = record
+
+        for ip in uncached_ips:
+            if ip not in records:
+                geolocation_negative_cache.set(ip, True)
+
+        return (
+            {ip: records[ip] for ip in unique_ips if ip in records},
+            [ip for ip in unique_ips if ip not in records],
+        )
+
+    async def create(self, obj_new: IPGeolocationCreate) -> IPGeolocation | None:
+        """Commit new geolocation to the database and invalidate its cache entries."""
+        created_record = await super().create(obj_new)
+        geolocation_cache.invalidate(obj_new.ip)
+        geolocation_negative_cache.invalidate(obj_new.ip)
+        if created_record is not None:
+            geolocation_counter.add(1)
+        return created_record
+
+    async def upsert(
+        self,
+        obj_new: IPGeolocationCreate,
+        update_existing: bool = settings.geolocation_refresh_on_conflict,
+    ) -> tuple[IPGeolocation, bool]:
+        """Store geolocation with single statement and invalidate its cache entries."""
+        try:
+            stored_record, inserted = await super().upsert(obj_new, update_existing)
+        finally:
+            geolocation_cache.invalidate(obj_new.ip)
+            geolocation_negative_cache.invalidate(obj_new.ip)
+        if inserted:
+            geolocation_counter.add(1)
+        return stored_record, inserted
+
+    async def create_many(
+        self, objs_new: Sequence[IPGeolocationCreate]
+    ) -> Sequence[IPGeolocation]:
+        """Insert new geolocations and invalidate their cache entries."""
+        created_records = await super().create_many(objs_new)
+        for obj_new in objs_new:
+            geolocation_cache.invalidate(obj_new.ip)
+            geolocation_negative_cache.invalidate(obj_new.ip)
+        geolocation_counter.add(len(created_records))
+        return created_records
+
+    async def bulk_import(
+        self,
+        batches: AsyncIterable[Sequence[IPGeolocationCreate]],
+        update_existing: bool = False,
+    ) -> tuple[int, int]:
+        """Import geolocations, rebuild rollups and drop in-memory caches.
+
+        Imports bypass incremental rollup maintenance, rollups are rebuilt
+        from scratch once the import is committed.
+        """
+        # imported ips are not known up front, all reads are pinned
+        mark_written(self.db, None)
+        try:
+            imported, stored = await super().bulk_import(batches, update_existing)
+        finally:
+            geolocation_cache.clear()
+            geolocation_negative_cache.clear()
+            geolocation_counter.clear()
+        if stored:
+            await IPGeolocationRollupRepository(db=self.db).rebuild()
+        return imported, stored
+
+    async def delete(self, ip: str) -> IPGeolocation | None:
+        """Delete geolocation from the database and invalidate its cache entry."""
+        deleted_record = await super().delete(ip)
+        geolocation_cache.invalidate(ip)
+        if deleted_record is not None:
+            geolocation_counter.add(-1)
+        return deleted_record
+
+    async def delete_many(self, ips: Sequence[str]) -> list[str]:
+        """Delete geolocations of given ips and invalidate their cache entries."""
+        return self._forget_deleted(await super().delete_many(ips))
+
+    async def delete_in_network(self, network: IPv4Network) -> list[str]:
+        """Delete geolocations inside network and invalidate their cache entries."""
+        return self._forget_deleted(await super().delete_in_network(network))
+
+    def _forget_deleted(self, deleted_ips: list[str]) -> list[str]:
+        for ip in deleted_ips:
+            geolocation_cache.invalidate(ip)
+        geolocation_counter.add(-len(deleted_ips))
+        return deleted_ips
+
+    async def count(
+        self, strategy: CountStrategy = settings.geolocation_count_strategy
+    ) -> int:
+        """Get total count of records using given counting strategy."""
+        if strategy is CountStrategy.ESTIMATED:
+            estimate = await self.estimated_count()
+            if estimate is not None:
+                return estimate
+
+        if strategy is CountStrategy.COUNTER:
+            counted = geolocation_counter.get()
+            if counted is not None:
+                return counted
+
+        total = await self.exact_count()
+        geolocation_counter.set(total)
+        return total
+
+    async def exact_count(self) -> int:
+        """Get exact count of records."""
+        query = (
+            select(func.count())
+            .select_from(self.sqla_model)
+            .execution_options(use_replica=True)
+        )
         result = await self.db.execute(query)
         return result.scalar()
 
-    async def list(self, offset: int = 0, limit: int = 10):
+    async def estimated_count(self) -> int | None:
+        """Get row count estimated by postgres planner statistics.
+
+        Returns None when estimate is not available - on other databases or
+        for tables that were never analyzed.
+        """
+        if self.dialect_name != "postgresql":
+            return None
+
+        query = text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+        ).execution_options(use_replica=True)
+        result = await self.db.execute(query, {"table": self.sqla_model.__tablename__})
+        estimate = result.scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
+
+    def _page_query(self, query: Select, offset: int, limit: int, after_id: int | None):
+        """Order query by primary key and restrict it to a single page.
+
+        When 'after_id' is given, records are sought on the primary key index
+        starting right after it (keyset pagination) and 'offset' is ignored.
+        """
+        query = query.order_by(self.sqla_model.id).limit(limit)
+        if after_id is not None:
+            return query.where(self.sqla_model.id > after_id)
+        return query.offset(offset)
+
+    async def list(self, offset: int = 0, limit: int = 10, after_id: int | None = None):
         """Get paginated list of IP geolocations."""
+        query = self._page_query(
+            select(self.sqla_model).execution_options(use_replica=True),
+            offset,
+            limit,
+            after_id,
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def list_rows(
+        self, offset: int = 0, limit: int = 10, after_id: int | None = None
+    ) -> Sequence[dict]:
+        """Get paginated list of IP geolocations as plain dicts.
+
+        Only columns of 'IPGeolocationInDB' are selected, with coordinates
+        cast to float, so rows can be serialized without building ORM
+        objects and validating them into schemas.
+        """
+        columns = [
+            cast(getattr(self.sqla_model, name), Float).label(name)
+            if name in ("latitude", "longitude")
+            else getattr(self.sqla_model, name)
+            for name in IPGeolocationInDB.model_fields
+        ]
+        query = self._page_query(
+            select(*columns).execution_options(use_replica=True),
+            offset,
+            limit,
+            after_id,
+        )
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def list_in_network(
+        self, network: IPv4Network, limit: int = 10, after_ip: str | None = None
+    ):
+        """Get geolocations with ip inside network, ordered by ip.
+
+        Records are sought on the ip index, 'after_ip' continues the scan
+        right after the last record of previous page.
+        """
         query = (
             select(self.sqla_model)
-            .order_by(self.sqla_model.id)
-            .offset(offset)
+            .where(self.ip_in_network(network))
+            .order_by(self.sqla_model.ip)
             .limit(limit)
+            .execution_options(use_replica=True)
         )
+        if after_ip is not None:
+            query = query.where(self.sqla_model.ip > after_ip)
         result = await self.db.execute(query)
         return result.scalars().all()
+
+    def _area_condition(
+        self,
+        boxes: Sequence[Box],
+        distance: ColumnElement[float],
+        max_distance: float | None = None,
+    ) -> ColumnElement[bool]:
+        """Match geolocations inside any of (south, west, north, east) boxes.
+
+        Candidates are sought on the geohash index by ranges of grid cells
+        covering each box, then filtered by exact coordinates and, when
+        'max_distance' is given, by 'distance' expression.
+        """
+        conditions = [
+            and_(
+                or_(
+                    *(
+                        self.sqla_model.geohash.between(low, high)
+                        for low, high in geohash_ranges(box)
+                    )
+                ),
+                self.sqla_model.latitude.between(box[0], box[2]),
+                self.sqla_model.longitude.between(box[1], box[3]),
+            )
+            for box in boxes
+        ]
+        condition = or_(*conditions)
+        if max_distance is not None:
+            condition = and_(condition, distance <= max_distance)
+        return condition
+
+    def _haversine_term(
+        self, latitude: float, longitude: float
+    ) -> ColumnElement[float]:
+        """Build haversine 'a' term of distance from a point, 0 (same point) to 1.
+
+        Term grows monotonically with great-circle distance, so it orders
+        and filters geolocations exactly without the final 'asin'.
+        """
+        row_latitude = func.radians(cast(self.sqla_model.latitude, Float))
+        row_longitude = func.radians(cast(self.sqla_model.longitude, Float))
+        half_latitude = func.sin((row_latitude - radians(latitude)) / 2)
+        half_longitude = func.sin((row_longitude - radians(longitude)) / 2)
+        return (
+            half_latitude * half_latitude
+            + cos(radians(latitude))
+            * func.cos(row_latitude)
+            * half_longitude
+            * half_longitude
+        )
+
+    async def list_by_distance(
+        self,
+        boxes: Sequence[Box],
+        latitude: float,
+        longitude: float,
+        offset: int = 0,
+        limit: int = 10,
+        radius_km: float | None = None,
+    ) -> Sequence[dict]:
+        """Get page of geolocations in boxes, nearest to a point first.
+
+        Ordering and paging is done by the database, only returned page is
+        loaded - as plain dicts of 'IPGeolocationInDB' fields.
+        """
+        distance = self._haversine_term(latitude, longitude)
+        query = (
+            select(
+                *(
+                    cast(getattr(self.sqla_model, name), Float).label(name)
+                    if name in ("latitude", "longitude")
+                    else getattr(self.sqla_model, name)
+                    for name in IPGeolocationInDB.model_fields
+                )
+            )
+            .where(
+                self._area_condition(boxes, distance, haversine_term_of_km(radius_km))
+            )
+            .order_by(distance, self.sqla_model.id)
+            .offset(offset)
+            .limit(limit)
+            .execution_options(use_replica=True)
+        )
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def count_in_area(
+        self,
+        boxes: Sequence[Box],
+        latitude: float,
+        longitude: float,
+        radius_km: float | None = None,
+    ) -> int:
+        """Count geolocations matched by 'list_by_distance'."""
+        distance = self._haversine_term(latitude, longitude)
+        query = (
+            select(func.count())
+            .select_from(self.sqla_model)
+            .where(
+                self._area_condition(boxes, distance, haversine_term_of_km(radius_km))
+            )
+            .execution_options(use_replica=True)
+        )
+        result = await self.db.execute(query)
+        return result.scalar()
+
+    async def stream(self, batch_size: int) -> AsyncIterator[Sequence[RowMapping]]:
+        """Stream all IP geolocations ordered by id in batches.
+
+        Rows are read through a server-side cursor and not loaded into the
+        session, so memory use does not depend on size of the table.
+        """
+        query = (
+            select(self.sqla_model.__table__)
+            .order_by(self.sqla_model.id)
+            .execution_options(yield_per=batch_size, use_replica=True)
+        )
+        result = await self.db.stream(query)
+        async for partition in result.mappings().partitions():
+            yield partition
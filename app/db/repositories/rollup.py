@@ -0,0 +1,146 @@
+"""Module containing repository of geolocation aggregate rollups."""
+
+from collections import Counter
+from enum import Enum
+from functools import reduce
+from typing import Any, Sequence
+
+from loguru import logger
+from sqlalchemy import delete, func, literal, select
+
+from app.db.models.models import IPGeolocation, IPGeolocationRollup
+from app.db.repositories.base import SQLAlchemyRepository
+
+
+class RollupDimension(str, Enum):
+    """Enum representing dimensions geolocations are aggregated by."""
+
+    CONTINENT = "continent"
+    COUNTRY = "country"
+    CITY = "city"
+
+
+# geolocation attributes making up group key and display name of each dimension,
+# cities are keyed within their country so that same-named cities stay apart
+ROLLUP_DIMENSIONS = {
+    RollupDimension.CONTINENT: (("continent_code",), "continent_name"),
+    RollupDimension.COUNTRY: (("country_code",), "country_name"),
+    RollupDimension.CITY: (("country_code", "city"), "city"),
+}
+ROLLUP_KEY_SEPARATOR = "/"
+
+
+def rollup_key(geolocation: Any, key_fields: Sequence[str]) -> str:
+    """Get group key of geolocation, e.g. 'US/Paris' for a city."""
+    return ROLLUP_KEY_SEPARATOR.join(
+        getattr(geolocation, key_field) or "" for key_field in key_fields
+    )
+
+
+def rollup_key_expression(key_fields: Sequence[str]) -> Any:
+    """Get SQL expression computing the same group key as 'rollup_key'."""
+    return reduce(
+        lambda key, part: key + ROLLUP_KEY_SEPARATOR + part,
+        [
+            func.coalesce(getattr(IPGeolocation, key_field), "")
+            for key_field in key_fields
+        ],
+    )
+
+
+class IPGeolocationRollupRepository(SQLAlchemyRepository):
+    """Maintain and read per-group geolocation counts.
+
+    Reads cost O(number of groups). Counts are adjusted incrementally inside
+    geolocation write transactions and can be rebuilt from scratch to repair
+    drift (e.g. after bulk imports).
+    """
+
+    sqla_model = IPGeolocationRollup
+
+    async def apply(self, inserted: Sequence[Any], deleted: Sequence[Any]) -> None:
+        """Adjust counts by stored and removed geolocations, without commit."""
+        deltas: Counter[tuple[str, str]] = Counter()
+        names: dict[tuple[str, str], str | None] = {}
+        for geolocations, sign in ((inserted, 1), (deleted, -1)):
+            for geolocation in geolocations:
+                for dimension, (key_fields, name_field) in ROLLUP_DIMENSIONS.items():
+                    group = (dimension.value, rollup_key(geolocation, key_fields))
+                    deltas[group] += sign
+                    names.setdefault(group, getattr(geolocation, name_field))
+
+        # sorted, concurrent transactions lock overlapping groups in the same
+        # order instead of deadlocking on each other
+        values = [
+            {
+                "dimension": dimension,
+                "key": key,
+                "name": names[dimension, key],
+                "count": delta,
+            }
+            for (dimension, key), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not values:
+            return
+
+        query = self.insert().values(values)
+        query = query.on_conflict_do_update(
+            index_elements=["dimension", "key"],
+            set_={
+                "count": self.sqla_model.count + query.excluded["count"],
+                "name": func.coalesce(query.excluded["name"], self.sqla_model.name),
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(query)
+
+    async def rebuild(self) -> int:
+        """Recompute all counts from geolocations table in one transaction.
+
+        Returns number of groups.
+        """
+        try:
+            await self.db.execute(delete(self.sqla_model))
+            for dimension, (key_fields, name_field) in ROLLUP_DIMENSIONS.items():
+                key = rollup_key_expression(key_fields)
+                await self.db.execute(
+                    self.insert().from_select(
+                        ["dimension", "key", "name", "count"],
+                        select(
+                            literal(dimension.value),
+                            key,
+                            func.max(getattr(IPGeolocation, name_field)),
+                            func.count(),
+                        ).group_by(key),
+                    )
+                )
+            result = await self.db.execute(
+                select(func.count()).select_from(self.sqla_model)
+            )
+            groups = result.scalar()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        logger.success("Rebuilt geolocation rollups, {} groups.", groups)
+
+        return groups
+
+    async def list(
+        self, dimension: RollupDimension, limit: int = 100
+    ) -> Sequence[IPGeolocationRollup]:
+        """Get groups of dimension with their counts, largest first."""
+        query = (
+            select(self.sqla_model)
+            .where(
+                self.sqla_model.dimension == dimension.value,
+                self.sqla_model.count > 0,
+            )
+            .order_by(self.sqla_model.count.desc(), self.sqla_model.key)
+            .limit(limit)
+            .execution_options(use_replica=True)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
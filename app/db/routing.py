@@ -0,0 +1,132 @@
+"""Module containing routing of database reads to replicas."""
+
+from itertools import count
+from time import monotonic
+from typing import Any, Hashable, Iterable, Sequence
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from config.settings import ReplicaSelection
+
+# Execution option marking statements which may be served by a replica.
+USE_REPLICA = "use_replica"
+# Execution option listing keys read by a statement, see 'mark_written'.
+REPLICA_KEYS = "replica_keys"
+# Session info entry collecting keys written in the current transaction.
+WRITTEN_KEYS = "written_keys"
+
+
+def mark_written(session: AsyncSession, keys: Iterable[Hashable] | None) -> None:
+    """Record keys written in session's transaction, None stands for all keys.
+
+    Once the transaction is committed, reads of these keys are pinned to the
+    primary for read-your-writes window.
+    """
+    if keys is None:
+        session.info[WRITTEN_KEYS] = None
+    elif session.info.get(WRITTEN_KEYS, ()) is not None:
+        session.info.setdefault(WRITTEN_KEYS, set()).update(keys)
+
+
+class ReplicaRouter:
+    """Pick engine statements are sent to - the primary or one of replicas.
+
+    After a write is committed, reads of written keys (ip addresses) are
+    pinned to the primary for 'read_your_writes_window' seconds, so
+    replication lag cannot hide freshly written rows. Reads of other keys
+    keep going to replicas. Writes of unknown keys (bulk imports) pin all
+    reads.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN,
+        read_your_writes_window: float = 0.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.selection = selection
+        self.read_your_writes_window = read_your_writes_window
+        self._pinned_until = 0.0
+        # pinned keys in order of expiry, each pin moves key to the end
+        self._pinned_keys: dict[Hashable, float] = {}
+        self._turns = count()
+
+    @property
+    def pinned(self) -> bool:
+        """Check whether all reads are pinned to the primary after a write."""
+        return monotonic() < self._pinned_until
+
+    def is_pinned(self, keys: Iterable[Hashable]) -> bool:
+        """Check whether reads of any of keys are pinned to the primary."""
+        now = monotonic()
+        return self.pinned or any(self._pinned_keys.get(key, 0.0) > now for key in keys)
+
+    def pin(self, keys: Iterable[Hashable] | None = None) -> None:
+        """Pin reads of keys, or all reads, for read-your-writes window."""
+        now = monotonic()
+        pinned_until = now + self.read_your_writes_window
+        if keys is None:
+            self._pinned_until = pinned_until
+            return
+
+        for key in keys:
+            self._pinned_keys.pop(key, None)
+            self._pinned_keys[key] = pinned_until
+        for key, key_pinned_until in list(self._pinned_keys.items()):
+            if key_pinned_until > now:
+                break
+            del self._pinned_keys[key]
+
+    def replica(self) -> AsyncEngine:
+        """Get replica the next read is sent to."""
+        if self.selection is ReplicaSelection.LEAST_BUSY:
+            return min(self.replicas, key=lambda engine: engine.pool.checkedout())
+        return self.replicas[next(self._turns) % len(self.replicas)]
+
+    def read_engine(self, keys: Iterable[Hashable] = ()) -> AsyncEngine:
+        """Get engine for a read of keys which tolerates replication lag."""
+        if not self.replicas or self.is_pinned(keys):
+            return self.primary
+        return self.replica()
+
+
+class RoutingSession(Session):
+    """Session sending reads marked with 'use_replica' option to replicas.
+
+    Everything else goes to the primary, and so do all reads following a
+    write in the same transaction, so they see the uncommitted changes.
+    """
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.wrote = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs: Any) -> Engine:
+        if not self.wrote and clause is not None:
+            options = clause.get_execution_options()
+            if options.get(USE_REPLICA):
+                return self.router.read_engine(
+                    options.get(REPLICA_KEYS, ())
+                ).sync_engine
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.wrote = True
+        return self.router.primary.sync_engine
+
+    def commit(self) -> None:
+        super().commit()
+        if WRITTEN_KEYS in self.info:
+            self.router.pin(self.info.pop(WRITTEN_KEYS))
+        self.wrote = False
+
+    def rollback(self) -> None:
+        super().rollback()
+        self.info.pop(WRITTEN_KEYS, None)
+        self.wrote = False
@@ -0,0 +1,122 @@
+"""Module containing geospatial helpers backing location queries."""
+
+from math import asin, cos, pi, radians, sin, sqrt
+
+# bits per axis of the Z-order (morton) code, cells are ~0.6 m wide at equator
+GEOHASH_PRECISION = 26
+# upper bound of cells used to cover a box, more cells mean tighter cover
+# but longer index range list in the query
+GEOHASH_MAX_COVER_CELLS = 32
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+Box = tuple[float, float, float, float]
+
+
+def _spread_bits(value: int) -> int:
+    """Insert zero bit after each of lower 32 bits of 'value'."""
+    value &= 0xFFFFFFFF
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    value = (value | (value << 1)) & 0x5555555555555555
+    return value
+
+
+def _cell(value: float, low: float, high: float, bits: int) -> int:
+    """Quantize coordinate into one of 2^bits cells along its axis."""
+    cells = 1 << bits
+    return min(max(int((value - low) / (high - low) * cells), 0), cells - 1)
+
+
+def _morton(x: int, y: int) -> int:
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def geohash(latitude: float | None, longitude: float | None) -> int | None:
+    """Get integer Z-order code of a point, nearby points share code prefixes."""
+    if latitude is None or longitude is None:
+        return None
+
+    return _morton(
+        _cell(float(longitude), -180.0, 180.0, GEOHASH_PRECISION),
+        _cell(float(latitude), -90.0, 90.0, GEOHASH_PRECISION),
+    )
+
+
+def geohash_ranges(box: Box) -> list[tuple[int, int]]:
+    """Get inclusive geohash ranges of grid cells covering (south, west, north, east) box.
+
+    Coarsest grid level covering the box with at most 'GEOHASH_MAX_COVER_CELLS'
+    cells is chosen, every cell maps to one contiguous range of full precision
+    codes. Cover may exceed the box, matches have to be filtered exactly.
+    """
+    south, west, north, east = box
+    for level in range(GEOHASH_PRECISION, -1, -1):
+        x_cells = range(
+            _cell(west, -180.0, 180.0, level), _cell(east, -180.0, 180.0, level) + 1
+        )
+        y_cells = range(
+            _cell(south, -90.0, 90.0, level), _cell(north, -90.0, 90.0, level) + 1
+        )
+        if len(x_cells) * len(y_cells) <= GEOHASH_MAX_COVER_CELLS:
+            break
+
+    shift = 2 * (GEOHASH_PRECISION - level)
+    codes = sorted(_morton(x, y) for x in x_cells for y in y_cells)
+    ranges: list[tuple[int, int]] = []
+    for code in codes:
+        low, high = code << shift, ((code + 1) << shift) - 1
+        if ranges and ranges[-1][1] + 1 == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
+
+
+def split_antimeridian(box: Box) -> list[Box]:
+    """Split box crossing antimeridian (west > east) into two regular ones."""
+    south, west, north, east = box
+    if west <= east:
+        return [box]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def radius_boxes(latitude: float, longitude: float, radius_km: float) -> list[Box]:
+    """Get boxes bounding circle of 'radius_km' around a point."""
+    delta_latitude = radius_km / KM_PER_DEGREE
+    south = max(latitude - delta_latitude, -90.0)
+    north = min(latitude + delta_latitude, 90.0)
+    if south == -90.0 or north == 90.0:
+        # circle contains a pole, all longitudes are in range
+        return [(south, -180.0, north, 180.0)]
+
+    delta_longitude = radius_km / (KM_PER_DEGREE * cos(radians(latitude)))
+    if delta_longitude >= 180.0:
+        return [(south, -180.0, north, 180.0)]
+
+    west = (longitude - delta_longitude + 180.0) % 360.0 - 180.0
+    east = (longitude + delta_longitude + 180.0) % 360.0 - 180.0
+    return split_antimeridian((south, west, north, east))
+
+
+def haversine_term_of_km(distance_km: float | None) -> float | None:
+    """Get haversine 'a' term of great-circle distance, see 'haversine_km'."""
+    if distance_km is None:
+        return None
+    return sin(min(distance_km / (2 * EARTH_RADIUS_KM), pi / 2)) ** 2
+
+
+def haversine_km(
+    latitude1: float, longitude1: float, latitude2: float, longitude2: float
+) -> float:
+    """Get great-circle distance between two points in kilometers."""
+    latitude1, longitude1, latitude2, longitude2 = map(
+        radians, (latitude1, longitude1, latitude2, longitude2)
+    )
+    a = (
+        sin((latitude2 - latitude1) / 2) ** 2
+        + cos(latitude1) * cos(latitude2) * sin((longitude2 - longitude1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(sqrt(a), 1.0))
@@ -0,0 +1,102 @@
+"""Module containing resolving and storing geolocations of many ip addresses."""
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.clients import IpstackClient
+from app.db.models.models import IPGeolocation
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.lookup import ip_range_lookup
+from app.models.models import IPGeolocationCreate
+from config.settings import settings
+
+
+async def resolve_geolocations_locally(
+    ip_addresses: list[str],
+) -> tuple[list[IPGeolocationCreate], list[str]]:
+    """Resolve ip addresses with local ip range database.
+
+    Returns found geolocations and ip addresses left for ipstack.
+    """
+    geolocations, remaining_ip_addresses = [], []
+    for ip_address in ip_addresses:
+        geolocation_response = await ip_range_lookup.lookup(ip_address)
+        if geolocation_response is None:
+            remaining_ip_addresses.append(ip_address)
+        else:
+            geolocations.append(IPGeolocationCreate(**geolocation_response))
+
+    return geolocations, remaining_ip_addresses
+
+
+async def fetch_geolocations_from_ipstack(
+    ipstack_client: IpstackClient, ip_addresses: list[str]
+) -> tuple[list[IPGeolocationCreate], dict[str, str]]:
+    """Resolve ip addresses through ipstack bulk api, chunk by chunk.
+
+    Returns geolocations ready to be stored and errors keyed by ip address.
+    """
+    geolocations, errors = [], {}
+    chunk_size = settings.ipstack_bulk_chunk_size
+
+    async with ipstack_client as client:
+        for start in range(0, len(ip_addresses), chunk_size):
+            chunk = ip_addresses[start : start + chunk_size]
+            try:
+                geolocation_responses = await client.get_bulk_geolocation(chunk)
+            except HTTPException as e:
+                errors.update(dict.fromkeys(chunk, e.detail))
+                continue
+
+            responses_by_ip = {
+                geolocation_response.get("ip"): geolocation_response
+                for geolocation_response in geolocation_responses
+            }
+            for ip_address in chunk:
+                geolocation_response = responses_by_ip.get(ip_address)
+                if geolocation_response is None:
+                    errors[ip_address] = "Geolocation not returned by ipstack."
+                    continue
+                try:
+                    geolocations.append(IPGeolocationCreate(**geolocation_response))
+                except ValidationError:
+                    errors[ip_address] = "Geolocation for IP is not available."
+
+    return geolocations, errors
+
+
+async def store_missing_geolocations(
+    ip_addresses: list[str],
+    ipstack_client: IpstackClient,
+    ip_geolocation_repo: IPGeolocationRepository,
+) -> tuple[dict[str, IPGeolocation], dict[str, IPGeolocation], dict[str, str]]:
+    """Resolve ip addresses missing in database and store them with one statement.
+
+    Ip addresses are resolved with local ip range database or ipstack bulk
+    requests. Returns created records, records stored concurrently by
+    another request and errors, all keyed by ip address.
+    """
+    geolocations, remote_ip_addresses = await resolve_geolocations_locally(ip_addresses)
+    errors = {}
+    if remote_ip_addresses:
+        ipstack_geolocations, errors = await fetch_geolocations_from_ipstack(
+            ipstack_client, remote_ip_addresses
+        )
+        geolocations.extend(ipstack_geolocations)
+
+    created_records = {
+        record.ip: record
+        for record in await ip_geolocation_repo.create_many(geolocations)
+    }
+    # geolocations stored concurrently by another request were skipped
+    skipped_ip_addresses = [
+        geolocation.ip
+        for geolocation in geolocations
+        if geolocation.ip not in created_records
+    ]
+    stored_records = {
+        record.ip: record
+        for record in await ip_geolocation_repo.get_many_by_ip(skipped_ip_addresses)
+    }
+
+    return created_records, stored_records, errors
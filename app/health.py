@@ -0,0 +1,123 @@
+"""Module containing background database health monitoring."""
+
+import asyncio
+from enum import Enum
+from time import monotonic
+from typing import Awaitable, Callable
+
+import anyio
+from loguru import logger
+from sqlalchemy import text
+
+from app.db.db_session import sessionmanager
+from config.settings import settings
+
+
+class CircuitState(str, Enum):
+    """Enum representing states of the database circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+async def ping_database() -> None:
+    """Run trivial query against the database, raise when it is unreachable."""
+    async with sessionmanager.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+class DatabaseHealthMonitor:
+    """Probe database periodically and keep shared circuit breaker state.
+
+    CLOSED - database is reachable, requests are served.
+    OPEN - 'failure_threshold' consecutive probes failed, requests are rejected
+    and probing is paused for 'reset_timeout' seconds.
+    HALF_OPEN - reset timeout elapsed, requests are let through and the next
+    probe decides whether circuit closes again or reopens.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[None]] = ping_database,
+        interval: float = settings.db_health_check_interval,
+        timeout: float = settings.db_health_check_timeout,
+        failure_threshold: int = settings.db_health_failure_threshold,
+        reset_timeout: float = settings.db_health_reset_timeout,
+    ) -> None:
+        self.check = check
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_available(self) -> bool:
+        """Check whether requests depending on the database may be served."""
+        return self.state is not CircuitState.OPEN
+
+    async def probe(self) -> bool:
+        """Run single health check and update circuit state."""
+        if self.state is CircuitState.OPEN:
+            if monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+
+        try:
+            with anyio.fail_after(self.timeout):
+                await self.check()
+        except Exception as e:
+            self._record_failure(e)
+            return False
+
+        self._record_success()
+        return True
+
+    def _record_success(self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            logger.info("Database health check passed, closing circuit.")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def _record_failure(self, error: Exception) -> None:
+        self.consecutive_failures += 1
+        logger.error("Database health check failed: {!r}", error)
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state is not CircuitState.OPEN:
+                logger.error("Database unavailable, opening circuit.")
+            self.state = CircuitState.OPEN
+            self.opened_at = monotonic()
+
+    async def run(self) -> None:
+        """Probe the database every 'interval' seconds until cancelled."""
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Run initial probe and start probing in the background."""
+        await self.probe()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+database_health = DatabaseHealthMonitor()
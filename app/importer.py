@@ -0,0 +1,125 @@
+"""Module containing bulk import of geolocation dumps."""
+
+import csv
+import json
+from enum import Enum
+from ipaddress import IPv4Address as ip_address_validator
+from time import perf_counter
+from typing import AsyncIterable, AsyncIterator
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationCreate
+from config.settings import settings
+
+
+class ImportFormat(str, Enum):
+    """Enum representing supported import formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportReport(BaseModel):
+    """Summary of a finished import."""
+
+    rows: int = 0
+    stored: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split stream of byte chunks into non empty text lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.decode()
+
+    if pending.strip():
+        yield pending.decode()
+
+
+def parse_geolocation(values: dict) -> IPGeolocationCreate | None:
+    """Validate single imported record, None when it has to be rejected.
+
+    Missing optional fields are stored as null.
+    """
+    try:
+        geolocation = IPGeolocationCreate(
+            **{**dict.fromkeys(IPGeolocationCreate.model_fields), **values}
+        )
+        geolocation.ip = str(ip_address_validator(geolocation.ip))
+    except (ValidationError, ValueError):
+        return None
+
+    return geolocation
+
+
+async def parse_batches(
+    lines: AsyncIterable[str], import_format: ImportFormat, report: ImportReport
+) -> AsyncIterator[list[IPGeolocationCreate]]:
+    """Parse lines into batches of valid geolocations, counting rejected ones.
+
+    Csv input has to start with a header row, quoted values cannot span lines.
+    """
+    fieldnames = None
+    batch = []
+    async for line in lines:
+        if import_format is ImportFormat.CSV:
+            values = next(csv.reader([line]))
+            if fieldnames is None:
+                fieldnames = values
+                continue
+            values = {key: value or None for key, value in zip(fieldnames, values)}
+        else:
+            try:
+                values = json.loads(line)
+            except ValueError:
+                values = None
+
+        report.rows += 1
+        geolocation = parse_geolocation(values) if isinstance(values, dict) else None
+        if geolocation is None:
+            report.rejected += 1
+            continue
+
+        batch.append(geolocation)
+        if len(batch) >= settings.geolocation_import_batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+async def import_geolocations(
+    ip_geolocation_repo: IPGeolocationRepository,
+    chunks: AsyncIterable[bytes],
+    import_format: ImportFormat,
+    update_existing: bool = False,
+) -> ImportReport:
+    """Import geolocation dump streamed as byte chunks."""
+    report = ImportReport()
+    started_at = perf_counter()
+
+    imported, stored = await ip_geolocation_repo.bulk_import(
+        parse_batches(iter_lines(chunks), import_format, report),
+        update_existing=update_existing,
+    )
+
+    report.stored = stored
+    report.skipped = imported - stored
+    report.seconds = perf_counter() - started_at
+    report.rows_per_second = report.rows / report.seconds if report.seconds else 0.0
+    # report is dumped only when info records are emitted
+    logger.opt(lazy=True).info("Geolocation import finished: {}", report.model_dump)
+
+    return report
@@ -0,0 +1,232 @@
+"""Module containing background geolocation enrichment jobs."""
+
+import asyncio
+from collections import OrderedDict
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+from uuid import uuid4
+
+import anyio
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.clients import IpstackClient
+from app.db.db_session import sessionmanager
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.geolocation import store_missing_geolocations
+from app.models.models import IPGeolocationInDB
+from config.settings import settings
+
+
+class JobState(str, Enum):
+    """Enum representing states of an enrichment job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class EnrichmentJob:
+    """Resolving and storing geolocation of a single ip address."""
+
+    ip_address: str
+    id: str = field(default_factory=lambda: uuid4().hex)
+    state: JobState = JobState.PENDING
+    data: IPGeolocationInDB | None = None
+    error: str | None = None
+
+
+class QueueFullError(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+class EnrichmentQueue:
+    """Queue of ip addresses waiting to be resolved and stored by workers.
+
+    Jobs of an ip address already waiting or running are coalesced into
+    one. Jobs stay available for polling for 'job_ttl' seconds. Meant to be
+    used from a single event loop, like 'TTLCache'.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        batch_size: int,
+        batch_wait: float,
+        history_size: int,
+        job_ttl: float,
+    ) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.jobs = TTLCache(maxsize=history_size, ttl=job_ttl)
+        self._pending: OrderedDict[str, EnrichmentJob] = OrderedDict()
+        self._active: dict[str, EnrichmentJob] = {}
+        self._wakeup: anyio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, ip_address: str) -> EnrichmentJob:
+        """Queue ip address, or get job already queued or running for it."""
+        job = self._active.get(ip_address)
+        if job is not None:
+            return job
+        if len(self._pending) >= self.maxsize:
+            raise QueueFullError(f"Enrichment queue is full ({self.maxsize} jobs).")
+
+        job = self._active[ip_address] = self._pending[ip_address] = EnrichmentJob(
+            ip_address=ip_address
+        )
+        self.jobs.set(job.id, job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def get(self, job_id: str) -> EnrichmentJob | None:
+        """Get job by id or None when it is unknown or expired."""
+        return self.jobs.get(job_id)
+
+    async def next_batch(self) -> list[EnrichmentJob]:
+        """Wait for pending jobs and take up to 'batch_size' of them."""
+        while True:
+            while not self._pending:
+                # shared by all waiting workers, each submit wakes them up
+                if self._wakeup is None or self._wakeup.is_set():
+                    self._wakeup = anyio.Event()
+                await self._wakeup.wait()
+
+            if len(self._pending) < self.batch_size:
+                # let more ip addresses arrive to fill the bulk request
+                await anyio.sleep(self.batch_wait)
+
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                _, job = self._pending.popitem(last=False)
+                job.state = JobState.RUNNING
+                batch.append(job)
+            if batch:
+                return batch
+
+    def finish(
+        self,
+        job: EnrichmentJob,
+        data: IPGeolocationInDB | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record outcome of a job, next submit of its ip starts a new one."""
+        job.data = data
+        job.error = error
+        job.state = JobState.FAILED if data is None else JobState.DONE
+        self._active.pop(job.ip_address, None)
+
+    def clear(self) -> None:
+        """Drop all jobs."""
+        self._pending.clear()
+        self._active.clear()
+        self.jobs.clear()
+
+
+async def process_batch(
+    queue: EnrichmentQueue,
+    jobs: list[EnrichmentJob],
+    ipstack_client: IpstackClient,
+    ip_geolocation_repo: IPGeolocationRepository,
+) -> None:
+    """Resolve ip addresses of jobs with bulk lookups and store them at once."""
+    ip_addresses = [job.ip_address for job in jobs]
+    # added by a synchronous request since the job was queued, validated
+    # before storing missing ones, whose commit expires loaded records
+    records = {
+        record.ip: IPGeolocationInDB.model_validate(record)
+        for record in await ip_geolocation_repo.get_many_by_ip(ip_addresses)
+    }
+    missing_ip_addresses = [
+        ip_address for ip_address in ip_addresses if ip_address not in records
+    ]
+
+    errors = {}
+    if missing_ip_addresses:
+        created_records, stored_records, errors = await store_missing_geolocations(
+            missing_ip_addresses, ipstack_client, ip_geolocation_repo
+        )
+        records.update(created_records)
+        records.update(stored_records)
+
+    for job in jobs:
+        record = records.get(job.ip_address)
+        if record is None:
+            error = errors.get(job.ip_address, "Geolocation could not be resolved.")
+            logger.error("Enrichment of '{}' failed: {}", job.ip_address, error)
+            queue.finish(job, error=error)
+        else:
+            queue.finish(job, data=IPGeolocationInDB.model_validate(record))
+
+
+class EnrichmentWorkers:
+    """In-process workers draining enrichment queue batch by batch."""
+
+    def __init__(
+        self,
+        queue: EnrichmentQueue,
+        workers: int = settings.enrichment_workers,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = sessionmanager.session,
+    ) -> None:
+        self.queue = queue
+        self.workers = workers
+        self.session_factory = session_factory
+        self.ipstack_client_factory: Callable[[], IpstackClient] = IpstackClient
+        self._tasks: list[asyncio.Task] = []
+
+    async def run(self) -> None:
+        """Process batches of queued jobs until cancelled."""
+        while True:
+            jobs = await self.queue.next_batch()
+            try:
+                async with self.session_factory() as session:
+                    await process_batch(
+                        self.queue,
+                        jobs,
+                        self.ipstack_client_factory(),
+                        IPGeolocationRepository(db=session),
+                    )
+            except Exception as e:
+                logger.exception("Enrichment batch of {} jobs failed.", len(jobs))
+                for job in jobs:
+                    if job.state is JobState.RUNNING:
+                        self.queue.finish(job, error=f"Enrichment failed: {e}")
+
+    async def start(
+        self, ipstack_client_factory: Callable[[], IpstackClient] = IpstackClient
+    ) -> None:
+        """Start workers in the background."""
+        self.ipstack_client_factory = ipstack_client_factory
+        self._tasks = [asyncio.create_task(self.run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop workers, jobs still queued are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+
+enrichment_queue = EnrichmentQueue(
+    maxsize=settings.enrichment_queue_size,
+    batch_size=settings.ipstack_bulk_chunk_size,
+    batch_wait=settings.enrichment_batch_wait,
+    history_size=settings.enrichment_job_history_size,
+    job_ttl=settings.enrichment_job_ttl,
+)
+enrichment_workers = EnrichmentWorkers(enrichment_queue)
@@ -0,0 +1,69 @@
+"""Module containing logging configuration."""
+
+import sys
+from time import monotonic
+
+from loguru import logger
+
+from config.settings import ApplicationEnvironment, settings
+
+# records at this level or above are never sampled out
+UNSAMPLED_LEVEL_NO = logger.level("CRITICAL").no
+
+
+class RateLimitFilter:
+    """Loguru filter letting through at most 'rate' records per call site per second.
+
+    Call site (module, function, line) stands for a message type, so a flood
+    of one message (e.g. invalid ip under attack traffic) cannot drown the
+    others. Number of dropped records is attached to the next record let
+    through as 'extra["sampled_out"]'. Rate of 0 disables sampling.
+
+    Runs in the calling thread before records are queued, counters are plain
+    dict entries updated without locks - under contention from threads they
+    may be off by a few records.
+    """
+
+    def __init__(self, rate: int) -> None:
+        self.rate = rate
+        self._windows: dict[tuple, list] = {}
+
+    def __call__(self, record: dict) -> bool:
+        if self.rate <= 0 or record["level"].no >= UNSAMPLED_LEVEL_NO:
+            return True
+
+        call_site = (record["name"], record["function"], record["line"])
+        now = monotonic()
+        window = self._windows.get(call_site)
+        if window is None or now - window[0] >= 1.0:
+            sampled_out = window[2] if window else 0
+            self._windows[call_site] = [now, 1, 0]
+            if sampled_out:
+                record["extra"]["sampled_out"] = sampled_out
+            return True
+
+        if window[1] < self.rate:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+def configure_logging() -> None:
+    """Replace default loguru sink with one configured from settings.
+
+    With 'log_enqueue' records are handed to a background thread, so request
+    handlers never block on sink I/O. With 'log_json' records are serialized
+    as JSON lines.
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=settings.log_level,
+        enqueue=settings.log_enqueue,
+        serialize=settings.log_json,
+        filter=RateLimitFilter(settings.log_rate_limit),
+        backtrace=settings.environment is ApplicationEnvironment.DEVELOPMENT,
+        diagnose=settings.environment is ApplicationEnvironment.DEVELOPMENT,
+    )
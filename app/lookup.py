@@ -0,0 +1,169 @@
+"""Module containing offline geolocation lookup in local ip range database."""
+
+import csv
+import os
+from array import array
+from bisect import bisect_right
+from ipaddress import IPv4Address
+from time import monotonic
+from typing import Any
+
+import anyio
+from loguru import logger
+
+from app.concurrency import SingleFlight
+from app.models.models import IPGeolocationBase
+from config.settings import settings
+
+LOCATION_FIELDS = tuple(
+    field for field in IPGeolocationBase.model_fields if field != "ip"
+)
+
+
+class IPRangeDatabase:
+    """Non-overlapping ipv4 ranges mapped to locations, searched by bisection.
+
+    Range bounds are kept in compact unsigned int arrays (4 bytes per bound)
+    and equal locations are stored once, so millions of ranges fit in memory
+    of a single worker.
+    """
+
+    def __init__(
+        self,
+        starts: array,
+        ends: array,
+        location_ids: array,
+        locations: list[tuple[Any, ...]],
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.location_ids = location_ids
+        self.locations = locations
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def load(cls, path: str) -> "IPRangeDatabase":
+        """Load ranges from CSV file with 'ip_start', 'ip_end' and location columns.
+
+        Location columns are named like geolocation fields, 'latitude' and
+        'longitude' are required, other missing ones are treated as empty.
+        Raises ValueError on malformed rows and overlapping ranges.
+        """
+        ranges = []
+        location_ids: dict[tuple[Any, ...], int] = {}
+        with open(path, newline="", encoding="utf-8") as file:
+            for line_number, row in enumerate(csv.DictReader(file), start=2):
+                try:
+                    start = int(IPv4Address(row["ip_start"]))
+                    end = int(IPv4Address(row["ip_end"]))
+                    row["latitude"] = float(row["latitude"])
+                    row["longitude"] = float(row["longitude"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid range at line {line_number}: {e!r}")
+                if end < start:
+                    raise ValueError(f"Range end before start at line {line_number}")
+
+                # empty csv cells stand for missing values, parsed coordinates
+                # are kept as they are, 0.0 included
+                location = tuple(
+                    row[field]
+                    if field in ("latitude", "longitude")
+                    else row.get(field) or None
+                    for field in LOCATION_FIELDS
+                )
+                location_id = location_ids.setdefault(location, len(location_ids))
+                ranges.append((start, end, location_id, line_number))
+
+        ranges.sort()
+        # bisection finds only the last range starting before an address
+        for previous, current in zip(ranges, ranges[1:]):
+            if current[0] <= previous[1]:
+                raise ValueError(
+                    f"Range at line {current[3]} overlaps range at line {previous[3]}"
+                )
+
+        return cls(
+            starts=array("I", (start for start, _, _, _ in ranges)),
+            ends=array("I", (end for _, end, _, _ in ranges)),
+            location_ids=array("I", (location_id for _, _, location_id, _ in ranges)),
+            locations=list(location_ids),
+        )
+
+    def lookup(self, ip_address: str) -> dict[str, Any] | None:
+        """Get location of ip address shaped like ipstack response, or None."""
+        address = int(IPv4Address(ip_address))
+        index = bisect_right(self.starts, address) - 1
+        if index < 0 or address > self.ends[index]:
+            return None
+
+        location = self.locations[self.location_ids[index]]
+        return {"ip": ip_address, **dict(zip(LOCATION_FIELDS, location))}
+
+
+class IPRangeLookup:
+    """Offline geolocation lookup, reloaded when the data file changes.
+
+    File modification time is checked at most every 'reload_interval'
+    seconds, a changed file is parsed in a worker thread and swapped in
+    atomically. When reload fails the previously loaded ranges keep serving.
+    Lookup is disabled when 'path' is empty.
+    """
+
+    def __init__(self, path: str | None, reload_interval: float) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+        self.database: IPRangeDatabase | None = None
+        self._loaded_mtime: int | None = None
+        self._checked_at: float | None = None
+        self._reloads = SingleFlight()
+
+    async def lookup(self, ip_address: str) -> dict[str, Any] | None:
+        """Get location of ip address or None when it is not covered."""
+        if not self.path:
+            return None
+
+        if (
+            self._checked_at is None
+            or monotonic() - self._checked_at >= self.reload_interval
+        ):
+            await self._reloads.do(self.path, self.reload)
+
+        if self.database is None:
+            return None
+        return self.database.lookup(ip_address)
+
+    async def reload(self) -> None:
+        """Load data file again when it changed since the last load."""
+        self._checked_at = monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            logger.error("Ip range database '{}' unavailable: {!r}", self.path, e)
+            return
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            database = await anyio.to_thread.run_sync(IPRangeDatabase.load, self.path)
+        except (OSError, ValueError, csv.Error) as e:
+            logger.error("Failed to load ip range database '{}': {!r}", self.path, e)
+            return
+
+        self.database = database
+        self._loaded_mtime = mtime
+        logger.info("Loaded {} ip ranges from '{}'.", len(database), self.path)
+
+    def clear(self) -> None:
+        """Drop loaded ranges, forcing reload on next lookup."""
+        self.database = None
+        self._loaded_mtime = None
+        self._checked_at = None
+
+
+# Consulted before ipstack when resolving geolocation of new ip addresses.
+ip_range_lookup = IPRangeLookup(
+    path=settings.ip_range_database_path,
+    reload_interval=settings.ip_range_database_reload_interval,
+)
@@ -2,11 +2,18 @@
 
 from config.settings import settings
 from contextlib import asynccontextmanager
+from functools import partial
 from fastapi import FastAPI
 from app.router import api_router_factory
-from app.middleware import DatabaseAvailabilityMiddleware
+from app.middleware import DatabaseAvailabilityMiddleware, MetricsMiddleware
 from app.db.db_session import sessionmanager
+from app.clients import IpstackClient, IpstackThrottle, create_ipstack_http_client
+from app.health import database_health
+from app.jobs import enrichment_workers
+from app.logging_config import configure_logging
+from app.lookup import ip_range_lookup
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
 
 
 @asynccontextmanager
@@ -15,10 +22,29 @@ async def lifespan(app: FastAPI):
     Function that handles startup and shutdown events.
     To understand more, read https://fastapi.tiangolo.com/advanced/events/
     """
+    configure_logging()
+    app.state.ipstack_http_client = create_ipstack_http_client()
+    app.state.ipstack_throttle = IpstackThrottle()
+    if ip_range_lookup.path:
+        await ip_range_lookup.reload()
+    if not settings.TESTING:
+        await database_health.start()
+        await enrichment_workers.start(
+            ipstack_client_factory=partial(
+                IpstackClient,
+                http_client=app.state.ipstack_http_client,
+                throttle=app.state.ipstack_throttle,
+            )
+        )
     yield
+    await enrichment_workers.stop()
+    await database_health.stop()
+    await app.state.ipstack_http_client.aclose()
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
+    # flush records still queued for the background sink
+    await logger.complete()
 
 
 def application_factory() -> FastAPI:
@@ -56,6 +82,8 @@ def application_factory() -> FastAPI:
     )
     if not settings.TESTING:
         app.add_middleware(DatabaseAvailabilityMiddleware)
+    # added last to be outermost, requests rejected by other middleware are timed too
+    app.add_middleware(MetricsMiddleware)
     app.include_router(api_router_factory(api_url_prefix))
 
     return app
@@ -0,0 +1,196 @@
+"""Module containing in-process metrics exposed in Prometheus text format.
+
+Metrics are updated from a single event loop (and threads driven by it,
+like sqlalchemy engine events), recording is plain arithmetic on
+preallocated counters - no locks, no allocations for known label sets.
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# seconds, same defaults as Prometheus client libraries
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple) -> str:
+    if not label_names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)
+    )
+    return f"{{{pairs}}}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    """Base of metrics keyed by label values."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render metric in Prometheus text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for label_values, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, *label_values, value: float) -> None:
+        self._values[label_values] = value
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # per label values: count of each bucket (last one is +Inf) and sum
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterator[str]:
+        label_names = (*self.label_names, "le")
+        for label_values, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = _format_labels(label_names, (*label_values, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {total[0]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time spent serving http requests.",
+    labels=("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Number of http requests being served."
+)
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing SQL statements.",
+    labels=("operation",),
+    buckets=SQL_BUCKETS,
+)
+ipstack_request_duration = Histogram(
+    "ipstack_request_duration_seconds",
+    "Time spent on ipstack api requests.",
+    labels=("status",),
+)
+cache_hit_ratio = Gauge(
+    "cache_hit_ratio", "Ratio of in-process cache hits.", labels=("cache",)
+)
+cache_size = Gauge(
+    "cache_size", "Number of in-process cache entries.", labels=("cache",)
+)
+db_pool_connections = Gauge(
+    "db_pool_connections", "Database pool connections by state.", labels=("state",)
+)
+db_pool_checkout_timeouts = Gauge(
+    "db_pool_checkout_timeouts", "Database pool checkouts that timed out."
+)
+db_pool_checkout_wait = Gauge(
+    "db_pool_checkout_wait_seconds_total", "Time spent waiting for pool checkouts."
+)
+
+METRICS = (
+    http_request_duration,
+    http_requests_in_flight,
+    db_statement_duration,
+    ipstack_request_duration,
+    cache_hit_ratio,
+    cache_size,
+    db_pool_connections,
+    db_pool_checkout_timeouts,
+    db_pool_checkout_wait,
+)
+
+
+def render_metrics() -> str:
+    """Render all metrics in Prometheus text exposition format."""
+    return "".join(metric.render() for metric in METRICS)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every SQL statement executed by engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["statement_started_at"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        db_statement_duration.observe(perf_counter() - started_at, operation)
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started_at"):
+            connection.info["statement_started_at"].pop()
@@ -1,44 +1,76 @@
 """Middleware for the application."""
 
-from fastapi import Request, status
+from time import perf_counter
+
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.health import database_health
+from app.metrics import http_request_duration, http_requests_in_flight
 
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
-from app.db.db_session import sessionmanager
-from asyncpg.exceptions import ConnectionDoesNotExistError
-from sqlalchemy.exc import OperationalError
 
+class DatabaseAvailabilityMiddleware:
+    """Pure ASGI middleware rejecting requests while the database is unavailable.
 
-class DatabaseAvailabilityMiddleware(BaseHTTPMiddleware):
-    """Middleware to check database availability."""
+    Availability is taken from the state kept by the background health
+    monitor, so no query is issued per request. Requests are passed straight
+    to the wrapped application, without buffering or wrapping response body.
+    """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Check database availability before processing the request."""
+        if scope["type"] != "http" or database_health.is_available:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "detail": "Database service is temporarily unavailable. Please try again later."
+            },
+        )
+        await response(scope, receive, send)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency and requests in flight.
+
+    Latency is labelled with the route template (e.g. '/api/geolocation')
+    matched by the router, not the raw path, to keep label cardinality
+    bounded. Unmatched requests share an empty route label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and count it while it is served."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = perf_counter()
+        http_requests_in_flight.inc()
         try:
-            async with sessionmanager.connect() as connection:
-                await connection.execute(text("SELECT 1"))
-                await connection.commit()
-                logger.debug("Database health check passed")
-
-        except (SQLAlchemyError, ConnectionDoesNotExistError, OperationalError) as e:
-            logger.error(f"Database health check failed: {str(e)}")
-            return JSONResponse(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={
-                    "detail": "Database service is temporarily unavailable. Please try again later."
-                },
-            )
-        except Exception as e:
-            logger.error(f"Unexpected database error: {str(e)}")
-            return JSONResponse(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={
-                    "detail": "Database service is temporarily unavailable. Please try again later."
-                },
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            http_request_duration.observe(
+                perf_counter() - started_at,
+                scope["method"],
+                getattr(route, "path", ""),
+                status_code,
             )
-
-        response = await call_next(request)
-        return response
@@ -0,0 +1,35 @@
+"""Module containing custom response classes."""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class PydanticJSONResponse(Response):
+    """JSON response rendered by compiled pydantic serializer.
+
+    Endpoints returning it (instead of the model itself) skip FastAPI's
+    second validation of the content against 'response_model' and the
+    intermediate dict - content is dumped straight into JSON bytes.
+    Content is either a model instance or, with 'adapter' given, plain
+    data matching adapter's type. It must be built from trusted data,
+    as it is serialized without any validation.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel | Any,
+        status_code: int = 200,
+        adapter: TypeAdapter | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.adapter = adapter
+        super().__init__(content, status_code, **kwargs)
+
+    def render(self, content: BaseModel | Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content)
+        return content.__pydantic_serializer__.to_json(content)
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 from app.api.handlers.maintenance import router as maintenance_router
+from app.api.handlers.admin import router as admin_router
 from app.api.handlers.geolocation.routers import (
     geolocation_api_router_factory,
 )
@@ -15,5 +16,6 @@ def api_router_factory(url_prefix: str) -> APIRouter:
         maintenance_router, prefix="/maintenance", tags=["Maintenance"]
     )
     router.include_router(geolocation_api_router_factory(), tags=["Geolocation"])
+    router.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
     return router
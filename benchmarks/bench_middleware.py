@@ -0,0 +1,91 @@
+"""Microbenchmark of database availability middleware overhead.
+
+Compares requests/sec of ping and get geolocation routes served through
+the previous BaseHTTPMiddleware implementation and the pure ASGI one.
+
+Run with: TESTING=1 python -m benchmarks.bench_middleware
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db.db_session import get_db_session
+from app.db.models.base import Base
+from app.db.models.models import IPGeolocation
+from app.health import database_health
+from app.main import application_factory
+from app.middleware import DatabaseAvailabilityMiddleware
+
+REQUESTS = 2000
+IP_ADDRESS = "8.8.8.8"
+
+
+class BaseHTTPDatabaseAvailabilityMiddleware(BaseHTTPMiddleware):
+    """Previous implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        if not database_health.is_available:
+            raise RuntimeError("database unavailable")
+        return await call_next(request)
+
+
+async def build_app(middleware_class) -> FastAPI:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with sessionmaker() as session:
+        session.add(IPGeolocation(ip=IP_ADDRESS, latitude=37.422, longitude=-122.084))
+        await session.commit()
+
+    async def get_db_session_override():
+        async with sessionmaker() as session:
+            yield session
+
+    app = application_factory()
+    app.dependency_overrides[get_db_session] = get_db_session_override
+    app.add_middleware(middleware_class)
+    return app
+
+
+async def requests_per_second(app: FastAPI, url: str, params: dict) -> float:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for _ in range(100):
+            await client.get(url, params=params)
+
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get(url, params=params)
+        return REQUESTS / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    routes = {
+        "ping": ("ping", {}),
+        "get geolocation": (
+            "get_geolocation_from_database",
+            {"ip_address": IP_ADDRESS},
+        ),
+    }
+    for middleware_class in (
+        BaseHTTPDatabaseAvailabilityMiddleware,
+        DatabaseAvailabilityMiddleware,
+    ):
+        app = await build_app(middleware_class)
+        for route_label, (route_name, params) in routes.items():
+            rps = await requests_per_second(app, app.url_path_for(route_name), params)
+            print(
+                f"{middleware_class.__name__:<42} {route_label:<16} {rps:>10.0f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
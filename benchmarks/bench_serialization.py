@@ -0,0 +1,114 @@
+"""Microbenchmark of list page serialization CPU cost.
+
+Compares CPU time per response of a list page of 100 records serialized
+the previous way (validating every ORM object into a schema, then FastAPI
+validating the whole page against 'response_model' again and encoding it
+with 'json.dumps') and through 'PydanticJSONResponse' fast path, which
+dumps plain rows straight to JSON bytes.
+
+Run with: TESTING=1 python -m benchmarks.bench_serialization
+"""
+
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.handlers.geolocation.list import (
+    PaginatedResponse,
+    PaginatedRows,
+    paginated_rows_adapter,
+)
+from app.db.models.models import IPGeolocation
+from app.models.models import IPGeolocationInDB
+from app.responses import PydanticJSONResponse
+
+PAGE_SIZE = 100
+ITERATIONS = 2000
+
+page_adapter = TypeAdapter(PaginatedResponse)
+
+
+def build_rows() -> list[IPGeolocation]:
+    return [
+        IPGeolocation(
+            id=index,
+            ip=f"10.0.{index // 256}.{index % 256}",
+            type="ipv4",
+            continent_code="NA",
+            continent_name="North America",
+            country_code="US",
+            country_name="United States",
+            region_code="CA",
+            region_name="California",
+            city="Mountain View",
+            zip="94043",
+            latitude=Decimal("37.4220000000000"),
+            longitude=Decimal("-122.0840000000000"),
+            updated_at=datetime(2025, 2, 20, 12, 0, 0),
+        )
+        for index in range(PAGE_SIZE)
+    ]
+
+
+def previous_path(rows: list[IPGeolocation]) -> bytes:
+    page = PaginatedResponse(
+        items=[IPGeolocationInDB.model_validate(row) for row in rows],
+        total=PAGE_SIZE,
+        offset=0,
+        limit=PAGE_SIZE,
+    )
+    # what FastAPI does with returned model: dump, validate, serialize, json.dumps
+    validated_page = page_adapter.validate_python(page.model_dump(by_alias=True))
+    return JSONResponse(page_adapter.dump_python(validated_page, mode="json")).body
+
+
+def fast_path(rows: list[dict]) -> bytes:
+    page = PaginatedRows(
+        items=rows, total=PAGE_SIZE, offset=0, limit=PAGE_SIZE, next_cursor=None
+    )
+    return PydanticJSONResponse(page, adapter=paginated_rows_adapter).body
+
+
+def as_plain_rows(rows: list[IPGeolocation]) -> list[dict]:
+    """Mirror rows returned by 'IPGeolocationRepository.list_rows'."""
+    plain_rows = []
+    for row in rows:
+        plain_row = {
+            name: getattr(row, name) for name in IPGeolocationInDB.model_fields
+        }
+        plain_row["latitude"] = float(row.latitude)
+        plain_row["longitude"] = float(row.longitude)
+        plain_rows.append(plain_row)
+    return plain_rows
+
+
+def cpu_microseconds_per_response(serialize, rows: list) -> float:
+    for _ in range(100):
+        serialize(rows)
+
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        serialize(rows)
+    return (time.process_time() - start) / ITERATIONS * 1_000_000
+
+
+def main() -> None:
+    rows = build_rows()
+    plain_rows = as_plain_rows(rows)
+    assert PaginatedResponse.model_validate_json(
+        previous_path(rows)
+    ) == PaginatedResponse.model_validate_json(fast_path(plain_rows))
+
+    for label, serialize, page_rows in (
+        ("previous", previous_path, rows),
+        ("fast path", fast_path, plain_rows),
+    ):
+        cpu = cpu_microseconds_per_response(serialize, page_rows)
+        print(f"{label:<12} page of {PAGE_SIZE:<5} {cpu:>10.0f} us CPU/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,31 @@ class ApplicationEnvironment(str, Enum):
     PRODUCTION = "production"
 
 
+class CountStrategy(str, Enum):
+    """Enum representing ways of counting stored geolocations.
+
+    exact - 'SELECT count(*)', accurate but scans the whole table.
+    estimated - row estimate from postgres planner statistics.
+    counter - in-process counter seeded with exact count and updated on
+    create/delete, resynced every 'geolocation_counter_resync_interval'.
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    COUNTER = "counter"
+
+
+class ReplicaSelection(str, Enum):
+    """Enum representing ways of picking read replica for a query.
+
+    round_robin - replicas take turns.
+    least_busy - replica with fewest connections checked out of its pool.
+    """
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_BUSY = "least_busy"
+
+
 class Settings(BaseSettings):
     """Project settings overritable by environment variables."""
 
@@ -25,11 +50,101 @@ class Settings(BaseSettings):
         default="http://127.0.0.1:8080", alias="APPLICATION_URL"
     )
 
+    # logging
+    log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    # write records from a background thread instead of the calling one
+    log_enqueue: bool = Field(default=True, alias="LOG_ENQUEUE")
+    # one JSON object per record instead of human readable lines
+    log_json: bool = Field(default=False, alias="LOG_JSON")
+    # records per second let through from a single call site, 0 disables sampling
+    log_rate_limit: int = Field(default=10, alias="LOG_RATE_LIMIT")
+
     ipstack_access_key: str = Field(default="", alias="IPSTACK_ACCESS_KEY")
     ipstack_api_url: str = Field(
         default="http://api.ipstack.com/", alias="IPSTACK_API_URL"
     )
     ipstack_timeout: int = Field(default=10, alias="IPSTACK_TIMEOUT")
+    ipstack_bulk_chunk_size: int = Field(default=50, alias="IPSTACK_BULK_CHUNK_SIZE")
+    # connection pool of the http client shared by all ipstack requests
+    ipstack_max_connections: int = Field(default=100, alias="IPSTACK_MAX_CONNECTIONS")
+    ipstack_max_keepalive_connections: int = Field(
+        default=20, alias="IPSTACK_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    ipstack_keepalive_expiry: float = Field(
+        default=30.0, alias="IPSTACK_KEEPALIVE_EXPIRY"
+    )
+    # requires the 'h2' package (httpx[http2]) and an https ipstack url
+    ipstack_http2: bool = Field(default=False, alias="IPSTACK_HTTP2")
+    # requests per second allowed by the ipstack plan, 0 disables limiting
+    ipstack_rate_limit: float = Field(default=10.0, alias="IPSTACK_RATE_LIMIT")
+    ipstack_rate_burst: int = Field(default=20, alias="IPSTACK_RATE_BURST")
+    ipstack_max_concurrency: int = Field(default=20, alias="IPSTACK_MAX_CONCURRENCY")
+    # retries of timeouts, connection errors and 429/5xx responses
+    ipstack_max_retries: int = Field(default=2, alias="IPSTACK_MAX_RETRIES")
+    ipstack_retry_backoff: float = Field(default=0.2, alias="IPSTACK_RETRY_BACKOFF")
+    ipstack_retry_backoff_max: float = Field(
+        default=5.0, alias="IPSTACK_RETRY_BACKOFF_MAX"
+    )
+    # seconds requests fail fast after ipstack reports usage limit (error 104)
+    ipstack_quota_cooldown: float = Field(
+        default=3600.0, alias="IPSTACK_QUOTA_COOLDOWN"
+    )
+
+    # local CSV of ip ranges consulted before ipstack, empty path disables it
+    ip_range_database_path: str | None = Field(
+        default=None, alias="IP_RANGE_DATABASE_PATH"
+    )
+    # how often the file is checked for changes (hot reload)
+    ip_range_database_reload_interval: float = Field(
+        default=60.0, alias="IP_RANGE_DATABASE_RELOAD_INTERVAL"
+    )
+
+    # in-memory cache of stored geolocations, size of 0 disables it
+    geolocation_cache_size: int = Field(default=10_000, alias="GEOLOCATION_CACHE_SIZE")
+    geolocation_cache_ttl: float = Field(default=300.0, alias="GEOLOCATION_CACHE_TTL")
+    # separate, short lived cache of ips known to be missing in the database
+    geolocation_negative_cache_size: int = Field(
+        default=10_000, alias="GEOLOCATION_NEGATIVE_CACHE_SIZE"
+    )
+    geolocation_negative_cache_ttl: float = Field(
+        default=30.0, alias="GEOLOCATION_NEGATIVE_CACHE_TTL"
+    )
+
+    # background enrichment of ips added with 'async' flag
+    enrichment_workers: int = Field(default=2, alias="ENRICHMENT_WORKERS")
+    # most ips waiting for a worker, further requests are rejected with 503
+    enrichment_queue_size: int = Field(default=10_000, alias="ENRICHMENT_QUEUE_SIZE")
+    # seconds a worker waits for more ips to fill a batch
+    enrichment_batch_wait: float = Field(default=0.05, alias="ENRICHMENT_BATCH_WAIT")
+    # finished jobs kept for polling their status
+    enrichment_job_history_size: int = Field(
+        default=100_000, alias="ENRICHMENT_JOB_HISTORY_SIZE"
+    )
+    enrichment_job_ttl: float = Field(default=3600.0, alias="ENRICHMENT_JOB_TTL")
+
+    geolocation_bulk_max_ips: int = Field(default=500, alias="GEOLOCATION_BULK_MAX_IPS")
+    geolocation_batch_max_ips: int = Field(
+        default=100, alias="GEOLOCATION_BATCH_MAX_IPS"
+    )
+    geolocation_bulk_delete_max_ips: int = Field(
+        default=10_000, alias="GEOLOCATION_BULK_DELETE_MAX_IPS"
+    )
+    geolocation_export_batch_size: int = Field(
+        default=1000, alias="GEOLOCATION_EXPORT_BATCH_SIZE"
+    )
+    geolocation_import_batch_size: int = Field(
+        default=10_000, alias="GEOLOCATION_IMPORT_BATCH_SIZE"
+    )
+    # overwrite stored geolocation when ip is added concurrently by other request
+    geolocation_refresh_on_conflict: bool = Field(
+        default=False, alias="GEOLOCATION_REFRESH_ON_CONFLICT"
+    )
+    geolocation_count_strategy: CountStrategy = Field(
+        default=CountStrategy.EXACT, alias="GEOLOCATION_COUNT_STRATEGY"
+    )
+    geolocation_counter_resync_interval: float = Field(
+        default=300.0, alias="GEOLOCATION_COUNTER_RESYNC_INTERVAL"
+    )
 
     # database settings
     db_user: str = Field(default="postgres", alias="DB_USER")
@@ -38,9 +153,68 @@ class Settings(BaseSettings):
     db_port: int = Field(default=5432, alias="DB_PORT")
     db_name: str = Field(default="GeolocationAPI", alias="DB_NAME")
 
+    # engine profile, SQL statements are echoed in development unless overridden
+    db_echo: bool | None = Field(default=None, alias="DB_ECHO")
+    db_pool_size: int = Field(default=20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    # ping on every checkout costs a round trip per request, stale connections
+    # are handled by 'db_pool_recycle' and the background health monitor
+    db_pool_pre_ping: bool = Field(default=False, alias="DB_POOL_PRE_PING")
+    # seconds after which connections are replaced, -1 keeps them forever
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    # prepared statements cached per connection (asyncpg and sqlalchemy caches)
+    db_statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+    # pgbouncer in transaction pooling mode cannot keep prepared statements,
+    # caches are disabled and statements get unique names
+    db_pgbouncer: bool = Field(default=False, alias="DB_PGBOUNCER")
+
+    # read replicas, comma separated 'host[:port]' list, empty disables routing
+    db_replica_hosts: str = Field(default="", alias="DB_REPLICA_HOSTS")
+    db_replica_selection: ReplicaSelection = Field(
+        default=ReplicaSelection.ROUND_ROBIN, alias="DB_REPLICA_SELECTION"
+    )
+    # seconds reads stay on the primary after a write, covers replication lag
+    db_read_your_writes_window: float = Field(
+        default=2.0, alias="DB_READ_YOUR_WRITES_WINDOW"
+    )
+
+    # background database health checks
+    db_health_check_interval: float = Field(
+        default=5.0, alias="DB_HEALTH_CHECK_INTERVAL"
+    )
+    db_health_check_timeout: float = Field(default=2.0, alias="DB_HEALTH_CHECK_TIMEOUT")
+    db_health_failure_threshold: int = Field(
+        default=1, alias="DB_HEALTH_FAILURE_THRESHOLD"
+    )
+    db_health_reset_timeout: float = Field(
+        default=10.0, alias="DB_HEALTH_RESET_TIMEOUT"
+    )
+
     @property
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def database_replica_urls(self) -> list[str]:
+        urls = []
+        for host in filter(None, map(str.strip, self.db_replica_hosts.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.db_port}"
+            urls.append(
+                f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{host}/{self.db_name}"
+            )
+        return urls
+
+    @property
+    def database_statement_cache_size(self) -> int:
+        return 0 if self.db_pgbouncer else self.db_statement_cache_size
+
+    @property
+    def database_echo(self) -> bool:
+        if self.db_echo is not None:
+            return self.db_echo
+        return self.environment is ApplicationEnvironment.DEVELOPMENT
+
 
 settings = Settings()
@@ -0,0 +1,35 @@
+"""Key city rollups by country
+
+Revision ID: 4f7b2c9e6a15
+Revises: e3a91f5c7d20
+Create Date: 2025-03-21 09:41:52.118730
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f7b2c9e6a15"
+down_revision: Union[str, None] = "e3a91f5c7d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def reseed_city_rollups(key_expression: str) -> None:
+    op.execute("DELETE FROM ipgeolocationrollup WHERE dimension = 'city'")
+    op.execute(
+        'INSERT INTO ipgeolocationrollup (dimension, "key", name, count) '
+        f"SELECT 'city', {key_expression}, max(city), count(*) FROM ipgeolocation "
+        f"GROUP BY {key_expression}"
+    )
+
+
+def upgrade() -> None:
+    reseed_city_rollups("coalesce(country_code, '') || '/' || coalesce(city, '')")
+
+
+def downgrade() -> None:
+    reseed_city_rollups("coalesce(city, '')")
@@ -0,0 +1,44 @@
+"""Store ip as inet
+
+Revision ID: 5b1e0c7a9f3d
+Revises: d8787ac95ebb
+Create Date: 2025-03-10 10:12:41.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e0c7a9f3d"
+down_revision: Union[str, None] = "d8787ac95ebb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # unique b-tree index on inet column serves '<<=' containment and ip order
+    op.alter_column(
+        "ipgeolocation",
+        "ip",
+        existing_type=sa.String(),
+        type_=postgresql.INET(),
+        existing_nullable=True,
+        postgresql_using="ip::inet",
+    )
+
+
+def downgrade() -> None:
+    # plain text cast of inet would append '/32' netmask
+    op.alter_column(
+        "ipgeolocation",
+        "ip",
+        existing_type=postgresql.INET(),
+        type_=sa.String(),
+        existing_nullable=True,
+        postgresql_using="host(ip)",
+    )
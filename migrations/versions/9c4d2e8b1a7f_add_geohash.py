@@ -0,0 +1,58 @@
+"""Add geohash
+
+Revision ID: 9c4d2e8b1a7f
+Revises: 5b1e0c7a9f3d
+Create Date: 2025-03-12 09:41:03.774120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.geo import geohash
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4d2e8b1a7f"
+down_revision: Union[str, None] = "5b1e0c7a9f3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column("ipgeolocation", sa.Column("geohash", sa.BigInteger(), nullable=True))
+
+    # geohash is computed in python, backfill stored rows batch by batch
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, latitude, longitude FROM ipgeolocation "
+                "WHERE id > :last_id ORDER BY id LIMIT :batch_size"
+            ),
+            {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text("UPDATE ipgeolocation SET geohash = :geohash WHERE id = :id"),
+            [
+                {"id": row.id, "geohash": geohash(row.latitude, row.longitude)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        op.f("ix_ipgeolocation_geohash"), "ipgeolocation", ["geohash"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_ipgeolocation_geohash"), table_name="ipgeolocation")
+    op.drop_column("ipgeolocation", "geohash")
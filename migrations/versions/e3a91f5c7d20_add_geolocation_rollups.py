@@ -0,0 +1,56 @@
+"""Add geolocation rollups
+
+Revision ID: e3a91f5c7d20
+Revises: 9c4d2e8b1a7f
+Create Date: 2025-03-14 11:02:17.309518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a91f5c7d20"
+down_revision: Union[str, None] = "9c4d2e8b1a7f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# geolocation columns holding group key and display name of each dimension
+ROLLUP_DIMENSIONS = {
+    "continent": ("continent_code", "continent_name"),
+    "country": ("country_code", "country_name"),
+    "city": ("city", "city"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ipgeolocationrollup",
+        sa.Column("dimension", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("dimension", "key"),
+    )
+
+    # seed rollups with groups of already stored geolocations
+    for dimension, (key_column, name_column) in ROLLUP_DIMENSIONS.items():
+        op.execute(
+            sa.text(
+                'INSERT INTO ipgeolocationrollup (dimension, "key", name, count) '
+                f"SELECT :dimension, coalesce({key_column}, ''), max({name_column}), "
+                f"count(*) FROM ipgeolocation GROUP BY coalesce({key_column}, '')"
+            ).bindparams(dimension=dimension)
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("ipgeolocationrollup")
@@ -6,6 +6,13 @@ import pytest_asyncio
 
 from fastapi import FastAPI
 from app.api.dependencies.common import ipstack_client_dependency
+from app.cache import (
+    geolocation_cache,
+    geolocation_counter,
+    geolocation_negative_cache,
+)
+from app.jobs import enrichment_queue
+from app.lookup import ip_range_lookup
 from app.main import application_factory
 from datetime import datetime
 from httpx import AsyncClient, ASGITransport
@@ -18,6 +25,7 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
 )
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
 from app.db.models.models import IPGeolocation as IPGeolocationModel
@@ -34,6 +42,14 @@ TestSessionLocal = sessionmaker(
 )
 
 
+@event.listens_for(test_engine.sync_engine, "before_cursor_execute", retval=True)
+def freeze_database_clock(conn, cursor, statement, parameters, context, executemany):
+    """Make timestamps set by the database (server defaults, 'now()') deterministic."""
+    return statement.replace("CURRENT_TIMESTAMP", "'2020-01-01 00:00:00.000000'"), (
+        parameters
+    )
+
+
 @pytest.fixture
 def app() -> FastAPI:
     """Get fastapi application instance."""
@@ -79,6 +95,14 @@ async def db_session() -> AsyncSession:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+def expire_on_commit(db_session: AsyncSession):
+    """Expire session objects on commit, like production sessions do."""
+    db_session.sync_session.expire_on_commit = True
+    yield
+    db_session.sync_session.expire_on_commit = False
+
+
 @pytest_asyncio.fixture(scope="function", autouse=True)
 async def session_override(app, db_session):
     async def get_db_session_override():
@@ -87,6 +111,22 @@ async def session_override(app, db_session):
     app.dependency_overrides[get_db_session] = get_db_session_override
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_caches():
+    """Prevent cached records from leaking between tests."""
+    geolocation_cache.clear()
+    geolocation_negative_cache.clear()
+    geolocation_counter.clear()
+    ip_range_lookup.clear()
+    enrichment_queue.clear()
+    yield
+    geolocation_cache.clear()
+    geolocation_negative_cache.clear()
+    geolocation_counter.clear()
+    enrichment_queue.clear()
+    ip_range_lookup.clear()
+
+
 @pytest.fixture
 def valid_ip1() -> str:
     """Return a valid IP address for testing."""
@@ -183,6 +223,7 @@ class MockIpstackClient:
             encoding="utf-8"
         ) as json_file:
             self.ipstack_geolocation_response = json.load(json_file)
+        self.bulk_requests = []
 
     async def __aenter__(self):
         return self
@@ -193,16 +234,25 @@ class MockIpstackClient:
     async def get_geolocation(self, ip_address: str):
         return self.ipstack_geolocation_response
 
+    async def get_bulk_geolocation(self, ip_addresses: list[str]):
+        self.bulk_requests.append(ip_addresses)
+        return [
+            {**self.ipstack_geolocation_response, "ip": ip_address}
+            for ip_address in ip_addresses
+        ]
+
 
 @pytest.fixture(scope="function", autouse=True)
 def mock_ipstack_client_dependency(app):
     """Mock FastAPI dependency for IpstackClient to prevent real API calls."""
 
+    mock_ipstack_client = MockIpstackClient()
+
     async def _mock_ipstack_client():
-        return MockIpstackClient()
+        return mock_ipstack_client
 
     app.dependency_overrides[ipstack_client_dependency] = _mock_ipstack_client
 
-    yield
+    yield mock_ipstack_client
 
     app.dependency_overrides.clear()
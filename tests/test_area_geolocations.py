@@ -0,0 +1,163 @@
+"""Module containing tests for radius and bounding box geolocation endpoints."""
+
+import pytest
+from fastapi import FastAPI, status
+
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.geo import geohash, geohash_ranges, haversine_km, radius_boxes
+from app.models.models import IPGeolocationCreate
+
+LOCATIONS = {
+    "8.8.8.8": (37.422, -122.084),  # Mountain View
+    "8.8.4.4": (37.774, -122.419),  # San Francisco
+    "1.1.1.1": (-33.868, 151.209),  # Sydney
+    "9.9.9.9": (-17.713, 178.065),  # Fiji
+}
+
+
+@pytest.fixture
+async def stored_locations(db_session: pytest.fixture) -> None:
+    await IPGeolocationRepository(db=db_session).create_many(
+        [
+            IPGeolocationCreate(
+                ip=ip,
+                type="IPv4",
+                continent_code=None,
+                continent_name=None,
+                country_code=None,
+                country_name=None,
+                region_code=None,
+                region_name=None,
+                city=None,
+                zip=None,
+                latitude=latitude,
+                longitude=longitude,
+            )
+            for ip, (latitude, longitude) in LOCATIONS.items()
+        ]
+    )
+
+
+def test_geohash_ranges_cover_points_inside_box():
+    """Test that cells covering a box contain geohashes of points inside it."""
+    ranges = geohash_ranges((37.0, -123.0, 38.0, -122.0))
+
+    for latitude, longitude in [(37.422, -122.084), (37.001, -122.999)]:
+        code = geohash(latitude, longitude)
+        assert any(low <= code <= high for low, high in ranges)
+    assert not any(low <= geohash(-33.868, 151.209) <= high for low, high in ranges)
+
+
+def test_radius_boxes_split_on_antimeridian():
+    """Test that circle crossing the antimeridian is bounded by two boxes."""
+    boxes = radius_boxes(-17.7, 179.9, 100)
+
+    assert len(boxes) == 2
+    assert boxes[0][3] == 180.0 and boxes[1][1] == -180.0
+
+
+def test_haversine_distance():
+    """Test great-circle distance between Mountain View and San Francisco."""
+    assert haversine_km(37.422, -122.084, 37.774, -122.419) == pytest.approx(
+        49.1, abs=0.5
+    )
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_nearby(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+    stored_locations: None,
+):
+    """Test that geolocations within radius are returned nearest first."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_nearby_from_database"),
+        params={"latitude": 37.7, "longitude": -122.4, "radius_km": 100},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [
+        "8.8.4.4",
+        "8.8.8.8",
+    ]
+    assert response.json()["total"] == 2
+    assert response.json()["items"][0]["distance_km"] < 10
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_nearby_paginated(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+    stored_locations: None,
+):
+    """Test paging through geolocations ordered by distance."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_nearby_from_database"),
+        params={
+            "latitude": 37.7,
+            "longitude": -122.4,
+            "radius_km": 20_000,
+            "offset": 2,
+            "limit": 1,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == ["9.9.9.9"]
+    assert response.json()["total"] == 4
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_in_box_across_antimeridian(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+    stored_locations: None,
+):
+    """Test bounding box with west greater than east."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_in_box_from_database"),
+        params={"south": -40, "west": 150, "north": 0, "east": -170},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [
+        "9.9.9.9",
+        "1.1.1.1",
+    ]
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_in_invalid_box(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+):
+    """Test bounding box with south edge above north one."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_in_box_from_database"),
+        params={"south": 10, "west": 0, "north": 0, "east": 10},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_list_by_distance_across_antimeridian(
+    db_session: pytest.fixture, stored_locations: None
+):
+    """Test that distance computed by the database wraps around antimeridian."""
+    repo = IPGeolocationRepository(db=db_session)
+    boxes = radius_boxes(-17.7, -179.9, 300)
+
+    rows = await repo.list_by_distance(boxes, -17.7, -179.9, radius_km=300)
+
+    assert [row["ip"] for row in rows] == ["9.9.9.9"]
+    assert await repo.count_in_area(boxes, -17.7, -179.9, radius_km=300) == 1
+    assert await repo.count_in_area(boxes, -17.7, -179.9, radius_km=100) == 0
@@ -0,0 +1,87 @@
+"""Module containing tests for the batch get geolocations endpoints."""
+
+from fastapi import status
+import pytest
+
+from config.settings import settings
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_batch(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    valid_ip2: pytest.fixture,
+    non_existent_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test retrieving stored geolocations of many ip addresses at once."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_batch_from_database"),
+        params={"ip_addresses": [valid_ip1, non_existent_ip, valid_ip2]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [valid_ip1, valid_ip2]
+    assert response.json()["missing"] == [non_existent_ip]
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_batch_by_body(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    non_existent_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+):
+    """Test that batch read by body does not add missing geolocations."""
+    response = await httpx_async_client.post(
+        app.url_path_for("get_geolocations_batch_from_database_by_body"),
+        json={"ip_addresses": [valid_ip1, non_existent_ip]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [valid_ip1]
+    assert response.json()["missing"] == [non_existent_ip]
+    assert mock_ipstack_client_dependency.bulk_requests == []
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_batch_with_invalid_ip_address(
+    app: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    invalid_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test retrieving batch containing invalid ip address."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_batch_from_database"),
+        params={"ip_addresses": [valid_ip1, invalid_ip]},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {"detail": f"Invalid IP address: '{invalid_ip}'"}
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_batch_with_too_many_ips(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that size of a batch is limited."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_batch_from_database"),
+        params={"ip_addresses": ["1.1.1.1"] * (settings.geolocation_batch_max_ips + 1)},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, (
+        f"Response status code: {response.status_code}"
+    )
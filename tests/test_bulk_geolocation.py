@@ -0,0 +1,111 @@
+"""Module containing tests for the bulk_add_geolocations endpoint."""
+
+from fastapi import status
+import pytest
+
+from config.settings import settings
+
+
+@pytest.mark.anyio
+async def test_bulk_add_geolocations(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    invalid_ip: pytest.fixture,
+    non_existent_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+):
+    """Test resolving stored, new and invalid ip addresses in one request."""
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_add_geolocations_to_database"),
+        json={"ip_addresses": [valid_ip1, non_existent_ip, invalid_ip]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    results = response.json()["results"]
+    assert [(result["ip_address"], result["status"]) for result in results] == [
+        (valid_ip1, "found"),
+        (non_existent_ip, "created"),
+        (invalid_ip, "error"),
+    ]
+    assert results[0]["data"]["city"] == "Mountain View"
+    assert results[1]["data"]["ip"] == non_existent_ip
+    assert results[2]["error"] == f"Invalid IP address: '{invalid_ip}'"
+    assert mock_ipstack_client_dependency.bulk_requests == [[non_existent_ip]]
+
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocation_from_database"),
+        params={"ip_address": non_existent_ip},
+    )
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_bulk_add_geolocations_with_expiring_session(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    expire_on_commit: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    non_existent_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+):
+    """Test that stored records outlive commit of new ones in the same request."""
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_add_geolocations_to_database"),
+        json={"ip_addresses": [valid_ip1, non_existent_ip]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    results = response.json()["results"]
+    assert [(result["status"], result["data"]["ip"]) for result in results] == [
+        ("found", valid_ip1),
+        ("created", non_existent_ip),
+    ]
+
+
+@pytest.mark.anyio
+async def test_bulk_add_geolocations_in_chunks(
+    app: pytest.fixture,
+    mocker,
+    httpx_async_client: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+):
+    """Test that missing ip addresses are sent to ipstack in chunks."""
+    mocker.patch.object(settings, "ipstack_bulk_chunk_size", 2)
+    ip_addresses = ["1.1.1.1", "1.1.1.2", "1.1.1.3", "1.1.1.1"]
+
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_add_geolocations_to_database"),
+        json={"ip_addresses": ip_addresses},
+    )
+
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["created"] * 4
+    assert mock_ipstack_client_dependency.bulk_requests == [
+        ["1.1.1.1", "1.1.1.2"],
+        ["1.1.1.3"],
+    ]
+
+
+@pytest.mark.anyio
+async def test_bulk_add_geolocations_with_too_many_ips(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that size of a bulk request is limited."""
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_add_geolocations_to_database"),
+        json={"ip_addresses": ["1.1.1.1"] * (settings.geolocation_bulk_max_ips + 1)},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, (
+        f"Response status code: {response.status_code}"
+    )
@@ -0,0 +1,116 @@
+"""Module containing tests for in-process geolocation cache."""
+
+import pytest
+from fastapi import FastAPI, status
+
+from app.cache import TTLCache, geolocation_cache, geolocation_negative_cache
+
+
+def test_cache_evicts_least_recently_used_entry():
+    """Test that the least recently used entry is evicted when cache is full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("8.8.8.8", 1)
+    cache.set("8.8.8.7", 2)
+    cache.get("8.8.8.8")
+    cache.set("1.1.1.1", 3)
+
+    assert cache.get("8.8.8.7") is None
+    assert cache.get("8.8.8.8") == 1
+    assert cache.get("1.1.1.1") == 3
+
+
+def test_cache_entry_expires_after_ttl(mocker):
+    """Test that entries are not returned after their time to live."""
+    monotonic = mocker.patch("app.cache.monotonic", return_value=100.0)
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("8.8.8.8", 1)
+
+    monotonic.return_value = 109.0
+    assert cache.get("8.8.8.8") == 1
+
+    monotonic.return_value = 110.0
+    assert cache.get("8.8.8.8") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_with_zero_size_is_disabled():
+    """Test that cache of size 0 does not store anything."""
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("8.8.8.8", 1)
+
+    assert cache.get("8.8.8.8") is None
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_is_served_from_cache(
+    app: FastAPI,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that repeated lookups hit the cache and delete invalidates it."""
+    url = app.url_path_for("get_geolocation_from_database")
+
+    first_response = await httpx_async_client.get(url, params={"ip_address": valid_ip1})
+    second_response = await httpx_async_client.get(
+        url, params={"ip_address": valid_ip1}
+    )
+
+    assert first_response.json() == second_response.json()
+    assert geolocation_cache.stats()["hits"] == 1
+
+    await httpx_async_client.delete(
+        app.url_path_for("delete_geolocation_from_database"),
+        params={"ip_address": valid_ip1},
+    )
+    response = await httpx_async_client.get(url, params={"ip_address": valid_ip1})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_cache_stats(app: FastAPI, httpx_async_client: pytest.fixture):
+    """Test cache statistics endpoint."""
+    response = await httpx_async_client.get(app.url_path_for("cache_stats"))
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert set(response.json()["geolocation"]) == {
+        "size",
+        "maxsize",
+        "hits",
+        "misses",
+        "hit_ratio",
+    }
+
+
+@pytest.mark.anyio
+async def test_not_found_lookup_is_cached_until_geolocation_is_added(
+    app: FastAPI,
+    valid_ip1: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that missing ips are cached and invalidated when added."""
+    url = app.url_path_for("get_geolocation_from_database")
+
+    for _ in range(2):
+        response = await httpx_async_client.get(url, params={"ip_address": valid_ip1})
+        assert response.status_code == status.HTTP_404_NOT_FOUND, (
+            f"Response status code: {response.status_code}"
+        )
+    assert geolocation_negative_cache.stats()["hits"] == 1
+
+    await httpx_async_client.post(
+        app.url_path_for("add_geolocation_to_database"),
+        json={"ip_address": valid_ip1},
+    )
+    response = await httpx_async_client.get(url, params={"ip_address": valid_ip1})
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
@@ -0,0 +1,133 @@
+"""Module containing tests for background database health monitoring."""
+
+import pytest
+from fastapi import status
+
+from app.health import CircuitState, DatabaseHealthMonitor, database_health
+from app.middleware import DatabaseAvailabilityMiddleware
+
+
+class FlakyDatabase:
+    """Health check stub failing on demand."""
+
+    def __init__(self):
+        self.available = True
+        self.checks = 0
+
+    async def __call__(self):
+        self.checks += 1
+        if not self.available:
+            raise ConnectionError("connection refused")
+
+
+@pytest.fixture
+def database() -> FlakyDatabase:
+    return FlakyDatabase()
+
+
+@pytest.fixture
+def monitor(database: FlakyDatabase) -> DatabaseHealthMonitor:
+    return DatabaseHealthMonitor(
+        check=database, interval=1, timeout=1, failure_threshold=2, reset_timeout=10
+    )
+
+
+@pytest.mark.anyio
+async def test_circuit_opens_after_consecutive_failures(
+    mocker, database: FlakyDatabase, monitor: DatabaseHealthMonitor
+):
+    """Test that circuit opens once failure threshold is reached."""
+    mocker.patch("app.health.monotonic", return_value=100.0)
+    database.available = False
+
+    assert not await monitor.probe()
+    assert monitor.state is CircuitState.CLOSED
+    assert monitor.is_available
+
+    assert not await monitor.probe()
+    assert monitor.state is CircuitState.OPEN
+    assert not monitor.is_available
+
+
+@pytest.mark.anyio
+async def test_open_circuit_is_not_probed_before_reset_timeout(
+    mocker, database: FlakyDatabase, monitor: DatabaseHealthMonitor
+):
+    """Test that database is left alone while circuit is open."""
+    monotonic = mocker.patch("app.health.monotonic", return_value=100.0)
+    database.available = False
+    await monitor.probe()
+    await monitor.probe()
+
+    monotonic.return_value = 105.0
+    database.available = True
+    assert not await monitor.probe()
+    assert database.checks == 2
+    assert monitor.state is CircuitState.OPEN
+
+
+@pytest.mark.anyio
+async def test_half_open_circuit_closes_on_success(
+    mocker, database: FlakyDatabase, monitor: DatabaseHealthMonitor
+):
+    """Test that successful trial probe closes the circuit."""
+    monotonic = mocker.patch("app.health.monotonic", return_value=100.0)
+    database.available = False
+    await monitor.probe()
+    await monitor.probe()
+
+    monotonic.return_value = 110.0
+    database.available = True
+    assert await monitor.probe()
+    assert monitor.state is CircuitState.CLOSED
+    assert monitor.consecutive_failures == 0
+
+
+@pytest.mark.anyio
+async def test_half_open_circuit_reopens_on_failure(
+    mocker, database: FlakyDatabase, monitor: DatabaseHealthMonitor
+):
+    """Test that failed trial probe reopens the circuit immediately."""
+    monotonic = mocker.patch("app.health.monotonic", return_value=100.0)
+    database.available = False
+    await monitor.probe()
+    await monitor.probe()
+
+    monotonic.return_value = 110.0
+    assert not await monitor.probe()
+    assert monitor.state is CircuitState.OPEN
+    assert monitor.opened_at == 110.0
+
+
+@pytest.mark.anyio
+async def test_middleware_rejects_requests_while_circuit_is_open(
+    mocker, app, httpx_async_client
+):
+    """Test that requests fail fast with 503 while database is unavailable."""
+    app.add_middleware(DatabaseAvailabilityMiddleware)
+    mocker.patch.object(
+        type(database_health), "is_available", new_callable=mocker.PropertyMock
+    ).return_value = False
+
+    response = await httpx_async_client.get(app.url_path_for("ping"))
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {
+        "detail": "Database service is temporarily unavailable. Please try again later."
+    }
+
+
+@pytest.mark.anyio
+async def test_middleware_passes_requests_while_circuit_is_closed(
+    app, httpx_async_client
+):
+    """Test that requests are served while database is available."""
+    app.add_middleware(DatabaseAvailabilityMiddleware)
+
+    response = await httpx_async_client.get(app.url_path_for("ping"))
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
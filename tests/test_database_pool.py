@@ -0,0 +1,69 @@
+"""Module containing tests for database engine profile and pool statistics."""
+
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import InstrumentedPool
+from config.settings import ApplicationEnvironment, Settings
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_and_timeouts():
+    """Test that pool counts checkouts and checkouts timing out."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+
+        stats = engine.pool.stats()
+        assert (stats["checkouts"], stats["timeouts"], stats["checked_out"]) == (
+            1,
+            1,
+            0,
+        )
+        assert stats["wait_seconds_max"] >= 0.1
+    finally:
+        await engine.dispose()
+
+
+def test_engine_profile_settings():
+    """Test that echo follows environment and pgbouncer mode disables caches."""
+    development = Settings(environment=ApplicationEnvironment.DEVELOPMENT)
+    production = Settings(
+        environment=ApplicationEnvironment.PRODUCTION, DB_PGBOUNCER=True
+    )
+
+    assert development.database_echo is True
+    assert production.database_echo is False
+    assert production.database_statement_cache_size == 0
+
+
+@pytest.mark.anyio
+async def test_pool_stats(app: FastAPI, httpx_async_client: pytest.fixture):
+    """Test that pool statistics are exposed under maintenance endpoints."""
+    response = await httpx_async_client.get(app.url_path_for("pool_stats"))
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert {"size", "checked_out", "timeouts", "wait_seconds_avg"} <= set(
+        response.json()
+    )
+
+
+def test_pool_pre_ping_is_opt_in():
+    """Test that connections are not pinged on every checkout by default."""
+    assert Settings().db_pool_pre_ping is False
+    assert Settings(DB_POOL_PRE_PING=True).db_pool_pre_ping is True
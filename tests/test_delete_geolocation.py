@@ -67,3 +67,84 @@ async def test_delete_invalid_ip_address(
     assert response.headers["Content-Type"] == "application/json", (
         f"Response content type: {response.headers['Content-Type']}"
     )
+
+
+@pytest.mark.anyio
+async def test_bulk_delete_geolocations(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    valid_ip2: pytest.fixture,
+    non_existent_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test deleting many geolocations at once."""
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_delete_geolocations_from_database"),
+        json={"ip_addresses": [valid_ip1, valid_ip2, non_existent_ip]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {"deleted": 2}
+
+
+@pytest.mark.anyio
+async def test_bulk_delete_invalid_ip_address(
+    app: pytest.fixture,
+    invalid_ip: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test deleting many geolocations with invalid ip address among them."""
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_delete_geolocations_from_database"),
+        json={"ip_addresses": [invalid_ip]},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_delete_geolocations_range(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    valid_ip2: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test deleting geolocations inside CIDR range."""
+    response = await httpx_async_client.delete(
+        app.url_path_for("delete_geolocations_range_from_database"),
+        params={"cidr": "8.8.8.8/32"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {"deleted": 1}
+
+    response = await httpx_async_client.get(
+        app.url_path_for("list_all_geolocations_from_database")
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [valid_ip2]
+
+
+@pytest.mark.anyio
+async def test_delete_geolocations_invalid_range(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test deleting geolocations with malformed CIDR range."""
+    response = await httpx_async_client.delete(
+        app.url_path_for("delete_geolocations_range_from_database"),
+        params={"cidr": "8.8.8.8/33"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {"detail": "Invalid CIDR range: '8.8.8.8/33'"}
@@ -0,0 +1,144 @@
+"""Module containing tests for background geolocation enrichment jobs."""
+
+import json
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from fastapi import FastAPI, status
+
+from app.jobs import EnrichmentWorkers, JobState, enrichment_queue, process_batch
+from app.db.repositories.geolocation import IPGeolocationRepository
+
+
+async def add_geolocation_async(app: FastAPI, client, ip_address: str):
+    return await client.post(
+        app.url_path_for("add_geolocation_to_database"),
+        params={"async": True},
+        content=json.dumps({"ip_address": ip_address}),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+@pytest.mark.anyio
+async def test_add_geolocation_async(
+    app: FastAPI,
+    db_session: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+    valid_ip1: str,
+    valid_ip2: str,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that queued ip addresses are resolved in one batch by a worker."""
+    responses = [
+        await add_geolocation_async(app, httpx_async_client, ip_address)
+        for ip_address in (valid_ip1, valid_ip2, valid_ip1)
+    ]
+
+    assert [response.status_code for response in responses] == [
+        status.HTTP_202_ACCEPTED
+    ] * 3
+    job_ids = [response.json()["job_id"] for response in responses]
+    assert job_ids[0] == job_ids[2] != job_ids[1]
+    assert responses[0].json()["state"] == JobState.PENDING
+    assert (
+        responses[0]
+        .headers["Location"]
+        .endswith(app.url_path_for("get_geolocation_job", job_id=job_ids[0]))
+    )
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    workers = EnrichmentWorkers(
+        enrichment_queue, workers=1, session_factory=session_factory
+    )
+    workers.ipstack_client_factory = lambda: mock_ipstack_client_dependency
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(workers.run)
+        with anyio.fail_after(5):
+            while enrichment_queue.get(job_ids[1]).state is not JobState.DONE:
+                await anyio.sleep(0.01)
+        task_group.cancel_scope.cancel()
+
+    response = await httpx_async_client.get(responses[0].headers["Location"])
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json()["state"] == JobState.DONE
+    assert response.json()["data"]["ip"] == valid_ip1
+    assert mock_ipstack_client_dependency.bulk_requests == [[valid_ip1, valid_ip2]]
+    assert await IPGeolocationRepository(db=db_session).get_by_ip(valid_ip2) is not None
+
+
+@pytest.mark.anyio
+async def test_add_existing_geolocation_async(
+    app: FastAPI,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: str,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that stored geolocation is returned right away instead of queued."""
+    response = await add_geolocation_async(app, httpx_async_client, valid_ip1)
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert len(enrichment_queue) == 0
+
+
+@pytest.mark.anyio
+async def test_process_batch_with_geolocation_stored_while_queued(
+    db_session: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    expire_on_commit: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+    valid_ip1: str,
+    non_existent_ip: str,
+):
+    """Test that stored geolocations outlive commit of new ones in the batch."""
+    stored_job = enrichment_queue.submit(valid_ip1)
+    new_job = enrichment_queue.submit(non_existent_ip)
+
+    await process_batch(
+        enrichment_queue,
+        await enrichment_queue.next_batch(),
+        mock_ipstack_client_dependency,
+        IPGeolocationRepository(db=db_session),
+    )
+
+    assert (stored_job.state, stored_job.data.city) == (JobState.DONE, "Mountain View")
+    assert (new_job.state, new_job.data.ip) == (JobState.DONE, non_existent_ip)
+    assert mock_ipstack_client_dependency.bulk_requests == [[non_existent_ip]]
+
+
+@pytest.mark.anyio
+async def test_add_geolocation_async_with_full_queue(
+    app: FastAPI,
+    mocker,
+    valid_ip1: str,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that requests are rejected while the queue is full."""
+    mocker.patch.object(enrichment_queue, "maxsize", 0)
+
+    response = await add_geolocation_async(app, httpx_async_client, valid_ip1)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.anyio
+async def test_get_unknown_job(app: FastAPI, httpx_async_client: pytest.fixture):
+    """Test that unknown job is reported as not found."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocation_job", job_id="unknown")
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND, (
+        f"Response status code: {response.status_code}"
+    )
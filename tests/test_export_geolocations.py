@@ -0,0 +1,77 @@
+"""Module containing tests for the export_geolocations endpoint."""
+
+import csv
+import io
+import json
+
+from fastapi import status
+import pytest
+
+from config.settings import settings
+
+
+@pytest.mark.anyio
+async def test_export_geolocations_as_ndjson(
+    app: pytest.fixture,
+    mocker,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    IPGeolocation1_InDB_Schema: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test streaming all geolocations as newline delimited json."""
+    mocker.patch.object(settings, "geolocation_export_batch_size", 1)
+
+    response = await httpx_async_client.get(
+        app.url_path_for("export_geolocations_from_database")
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.headers["Content-Type"] == "application/x-ndjson", (
+        f"Response content type: {response.headers['Content-Type']}"
+    )
+    lines = response.text.splitlines()
+    assert [json.loads(line)["ip"] for line in lines] == ["8.8.8.8", "8.8.8.7"]
+    assert json.loads(lines[0])["city"] == IPGeolocation1_InDB_Schema.city
+
+
+@pytest.mark.anyio
+async def test_export_geolocations_as_csv(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test streaming all geolocations as csv."""
+    response = await httpx_async_client.get(
+        app.url_path_for("export_geolocations_from_database"),
+        params={"format": "csv"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.headers["Content-Type"].startswith("text/csv"), (
+        f"Response content type: {response.headers['Content-Type']}"
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["ip"] for row in rows] == ["8.8.8.8", "8.8.8.7"]
+    assert rows[0]["latitude"] == "37.422"
+
+
+@pytest.mark.anyio
+async def test_export_empty_table(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test exporting geolocations when none are stored."""
+    response = await httpx_async_client.get(
+        app.url_path_for("export_geolocations_from_database")
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.text == ""
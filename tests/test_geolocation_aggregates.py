@@ -0,0 +1,155 @@
+"""Module containing tests for geolocation aggregates endpoint and rollups."""
+
+import pytest
+from fastapi import FastAPI, status
+
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.db.repositories.rollup import IPGeolocationRollupRepository, RollupDimension
+from app.models.models import IPGeolocationCreate
+
+
+@pytest.fixture
+def ip_geolocation_repo(db_session: pytest.fixture) -> IPGeolocationRepository:
+    return IPGeolocationRepository(db=db_session)
+
+
+@pytest.fixture
+def rollup_repo(db_session: pytest.fixture) -> IPGeolocationRollupRepository:
+    return IPGeolocationRollupRepository(db=db_session)
+
+
+def make_geolocation(
+    ip: str, country_code: str | None, city: str | None = None
+) -> IPGeolocationCreate:
+    return IPGeolocationCreate(
+        ip=ip,
+        type="IPv4",
+        continent_code=None,
+        continent_name=None,
+        country_code=country_code,
+        country_name={"US": "United States", "AU": "Australia"}.get(country_code),
+        region_code=None,
+        region_name=None,
+        city=city,
+        zip=None,
+        latitude=0.0,
+        longitude=0.0,
+    )
+
+
+async def country_counts(rollup_repo: IPGeolocationRollupRepository) -> dict:
+    groups = await rollup_repo.list(RollupDimension.COUNTRY)
+    return {group.key: group.count for group in groups}
+
+
+@pytest.mark.anyio
+async def test_rollups_follow_writes(
+    ip_geolocation_repo: IPGeolocationRepository,
+    rollup_repo: IPGeolocationRollupRepository,
+):
+    """Test that inserts, overwrites and deletes adjust rollups incrementally."""
+    await ip_geolocation_repo.create_many(
+        [
+            make_geolocation("8.8.8.8", "US"),
+            make_geolocation("8.8.4.4", "US"),
+            make_geolocation("9.9.9.9", None),
+        ]
+    )
+    await ip_geolocation_repo.upsert(make_geolocation("1.1.1.1", "AU"))
+    assert await country_counts(rollup_repo) == {"US": 2, "AU": 1, "": 1}
+
+    await ip_geolocation_repo.upsert(
+        make_geolocation("8.8.4.4", "AU"), update_existing=True
+    )
+    await ip_geolocation_repo.delete("9.9.9.9")
+    await ip_geolocation_repo.delete_many(["8.8.8.8"])
+    assert await country_counts(rollup_repo) == {"AU": 2}
+
+
+@pytest.mark.anyio
+async def test_rollups_rebuild_repairs_drift(
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    rollup_repo: IPGeolocationRollupRepository,
+):
+    """Test that rebuild counts geolocations written around the repository."""
+    assert await country_counts(rollup_repo) == {}
+
+    assert await rollup_repo.rebuild() == 3
+    assert await country_counts(rollup_repo) == {"US": 2}
+
+
+@pytest.mark.anyio
+async def test_rollups_key_cities_by_country(
+    ip_geolocation_repo: IPGeolocationRepository,
+    rollup_repo: IPGeolocationRollupRepository,
+):
+    """Test that same-named cities in different countries are counted apart."""
+    await ip_geolocation_repo.create_many(
+        [
+            make_geolocation("8.8.8.8", "US", "Paris"),
+            make_geolocation("8.8.4.4", "US", "Paris"),
+            make_geolocation("1.1.1.1", "FR", "Paris"),
+        ]
+    )
+    expected = [("US/Paris", "Paris", 2), ("FR/Paris", "Paris", 1)]
+
+    groups = await rollup_repo.list(RollupDimension.CITY)
+    assert [(group.key, group.name, group.count) for group in groups] == expected
+
+    await rollup_repo.rebuild()
+    groups = await rollup_repo.list(RollupDimension.CITY)
+    assert [(group.key, group.name, group.count) for group in groups] == expected
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_aggregates(
+    app: FastAPI,
+    ip_geolocation_repo: IPGeolocationRepository,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that groups are returned largest first."""
+    await ip_geolocation_repo.create_many(
+        [
+            make_geolocation("8.8.8.8", "US"),
+            make_geolocation("8.8.4.4", "US"),
+            make_geolocation("1.1.1.1", "AU"),
+        ]
+    )
+
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocation_aggregates_from_database"),
+        params={"dimension": "country"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {
+        "dimension": "country",
+        "groups": [
+            {"key": "US", "name": "United States", "count": 2},
+            {"key": "AU", "name": "Australia", "count": 1},
+        ],
+    }
+
+
+@pytest.mark.anyio
+async def test_import_rebuilds_rollups(
+    app: FastAPI,
+    rollup_repo: IPGeolocationRollupRepository,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that bulk import, bypassing incremental updates, rebuilds rollups."""
+    body = "\n".join(
+        make_geolocation(ip, "US").model_dump_json() for ip in ["8.8.8.8", "8.8.4.4"]
+    )
+
+    response = await httpx_async_client.post(
+        app.url_path_for("import_geolocations_to_database"), content=body
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert await country_counts(rollup_repo) == {"US": 2}
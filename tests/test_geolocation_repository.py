@@ -0,0 +1,125 @@
+"""Module containing tests for IPGeolocationRepository operations."""
+
+from ipaddress import IPv4Network
+
+import pytest
+
+from app.cache import geolocation_counter
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.geo import geohash
+from app.models.models import IPGeolocationCreate
+
+
+@pytest.fixture
+def ip_geolocation_repo(db_session: pytest.fixture) -> IPGeolocationRepository:
+    return IPGeolocationRepository(db=db_session)
+
+
+@pytest.fixture
+def IPGeolocation1_Create_Schema(
+    IPGeolocation1_InDB_Schema: pytest.fixture,
+) -> IPGeolocationCreate:
+    return IPGeolocationCreate(
+        **IPGeolocation1_InDB_Schema.model_dump(exclude={"id", "updated_at"})
+    )
+
+
+@pytest.mark.anyio
+async def test_upsert_new_geolocation(
+    ip_geolocation_repo: IPGeolocationRepository,
+    IPGeolocation1_Create_Schema: IPGeolocationCreate,
+):
+    """Test that upsert inserts geolocation not stored yet and counts it."""
+    geolocation_counter.set(0)
+    stored_record, inserted = await ip_geolocation_repo.upsert(
+        IPGeolocation1_Create_Schema
+    )
+
+    assert inserted is True
+    assert stored_record.id == 1
+    assert stored_record.city == IPGeolocation1_Create_Schema.city
+    assert await ip_geolocation_repo.exact_count() == 1
+    assert geolocation_counter.get() == 1
+
+
+@pytest.mark.anyio
+async def test_upsert_existing_geolocation_keeps_stored_one(
+    ip_geolocation_repo: IPGeolocationRepository,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation1_Create_Schema: IPGeolocationCreate,
+):
+    """Test that conflicting upsert returns stored geolocation untouched."""
+    IPGeolocation1_Create_Schema.city = "Glenmont"
+    geolocation_counter.set(1)
+
+    stored_record, inserted = await ip_geolocation_repo.upsert(
+        IPGeolocation1_Create_Schema
+    )
+
+    assert inserted is False
+    assert stored_record.id == 1
+    assert stored_record.city == "Mountain View"
+    assert await ip_geolocation_repo.exact_count() == 1
+    assert geolocation_counter.get() == 1
+
+
+@pytest.mark.anyio
+async def test_upsert_existing_geolocation_with_update(
+    ip_geolocation_repo: IPGeolocationRepository,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation1_Create_Schema: IPGeolocationCreate,
+):
+    """Test that conflicting upsert refreshes stored geolocation when asked to."""
+    IPGeolocation1_Create_Schema.city = "Glenmont"
+    geolocation_counter.set(1)
+
+    stored_record, inserted = await ip_geolocation_repo.upsert(
+        IPGeolocation1_Create_Schema, update_existing=True
+    )
+
+    assert inserted is False
+    assert stored_record.id == 1
+    assert stored_record.city == "Glenmont"
+    assert (await ip_geolocation_repo.get_by_ip(stored_record.ip)).city == "Glenmont"
+    assert geolocation_counter.get() == 1
+
+
+@pytest.mark.anyio
+async def test_list_in_network_orders_by_numeric_ip(
+    ip_geolocation_repo: IPGeolocationRepository,
+    IPGeolocation1_Create_Schema: IPGeolocationCreate,
+):
+    """Test that range lookup matches network and sorts ips numerically."""
+    await ip_geolocation_repo.create_many(
+        [
+            IPGeolocation1_Create_Schema.model_copy(update={"ip": ip})
+            for ip in ["10.0.0.10", "10.0.0.9", "10.0.1.0", "9.255.255.255"]
+        ]
+    )
+
+    records = await ip_geolocation_repo.list_in_network(IPv4Network("10.0.0.0/24"))
+    assert [record.ip for record in records] == ["10.0.0.9", "10.0.0.10"]
+
+    records = await ip_geolocation_repo.list_in_network(
+        IPv4Network("10.0.0.0/8"), after_ip="10.0.0.10"
+    )
+    assert [record.ip for record in records] == ["10.0.1.0"]
+
+
+@pytest.mark.anyio
+async def test_upsert_keeps_geohash_in_sync_with_location(
+    ip_geolocation_repo: IPGeolocationRepository,
+    IPGeolocation1_Create_Schema: IPGeolocationCreate,
+):
+    """Test that geohash is derived from location on insert and on update."""
+    stored_record, inserted = await ip_geolocation_repo.upsert(
+        IPGeolocation1_Create_Schema
+    )
+    assert stored_record.geohash == geohash(37.422, -122.084)
+
+    IPGeolocation1_Create_Schema.latitude = -33.868
+    IPGeolocation1_Create_Schema.longitude = 151.209
+    stored_record, inserted = await ip_geolocation_repo.upsert(
+        IPGeolocation1_Create_Schema, update_existing=True
+    )
+    assert stored_record.geohash == geohash(-33.868, 151.209)
@@ -71,3 +71,50 @@ async def test_get_invalid_ip_address(
     assert response.headers["Content-Type"] == "application/json", (
         f"Response content type: {response.headers['Content-Type']}"
     )
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_range(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    valid_ip2: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test paging through geolocations inside CIDR range."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_range_from_database"),
+        params={"cidr": "8.8.8.0/24", "limit": 1},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [item["ip"] for item in response.json()["items"]] == [valid_ip2]
+    assert response.json()["next_cursor"] == valid_ip2
+
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_range_from_database"),
+        params={"cidr": "8.8.8.0/24", "limit": 1, "after": valid_ip2},
+    )
+
+    assert [item["ip"] for item in response.json()["items"]] == [valid_ip1]
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_get_geolocations_invalid_range(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test getting geolocations with malformed CIDR range."""
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocations_range_from_database"),
+        params={"cidr": "8.8.8.1/24"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json() == {"detail": "Invalid CIDR range: '8.8.8.1/24'"}
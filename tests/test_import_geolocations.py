@@ -0,0 +1,83 @@
+"""Module containing tests for the import_geolocations endpoint."""
+
+import json
+
+from fastapi import status
+import pytest
+
+
+@pytest.mark.anyio
+async def test_import_geolocations_from_ndjson(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation1_InDB_Schema: pytest.fixture,
+    IPGeolocation2_InDB_Schema: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test importing geolocations, skipping stored and rejecting invalid ones."""
+    body = "\n".join(
+        [
+            IPGeolocation1_InDB_Schema.model_dump_json(),
+            IPGeolocation2_InDB_Schema.model_dump_json(),
+            json.dumps({"ip": "invalid_ip", "latitude": 1.0, "longitude": 1.0}),
+            "not json",
+        ]
+    )
+
+    response = await httpx_async_client.post(
+        app.url_path_for("import_geolocations_to_database"), content=body
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    report = response.json()
+    assert (
+        report["rows"],
+        report["stored"],
+        report["skipped"],
+        report["rejected"],
+    ) == (
+        4,
+        1,
+        1,
+        2,
+    )
+
+    response = await httpx_async_client.get(
+        app.url_path_for("list_all_geolocations_from_database")
+    )
+    assert [item["ip"] for item in response.json()["items"]] == ["8.8.8.8", "8.8.8.7"]
+
+
+@pytest.mark.anyio
+async def test_import_geolocations_from_csv_updating_existing(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test importing csv dump overwriting stored geolocations."""
+    body = (
+        "ip,type,country_code,city,latitude,longitude\n"
+        f"{valid_ip1},ipv4,US,Glenmont,40.5369987487793,-82.1285934448242\n"
+        "1.1.1.1,ipv4,AU,Sydney,-33.86,151.2\n"
+    )
+
+    response = await httpx_async_client.post(
+        app.url_path_for("import_geolocations_to_database"),
+        params={"format": "csv", "update_existing": True},
+        content=body,
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json()["stored"] == 2
+
+    response = await httpx_async_client.get(
+        app.url_path_for("get_geolocation_from_database"),
+        params={"ip_address": valid_ip1},
+    )
+    assert response.json()["city"] == "Glenmont"
+    assert response.json()["continent_name"] is None
@@ -0,0 +1,165 @@
+"""Module containing tests for offline ip range geolocation lookup."""
+
+import os
+
+import pytest
+from fastapi import FastAPI, status
+
+from app.lookup import IPRangeDatabase, IPRangeLookup, ip_range_lookup
+from app.models.models import IPGeolocationCreate
+
+RANGES_CSV = """ip_start,ip_end,country_code,city,latitude,longitude
+8.8.8.0,8.8.8.255,US,Mountain View,37.4,-122.07
+1.1.1.0,1.1.1.255,AU,Sydney,-33.86,151.2
+"""
+
+
+@pytest.fixture
+def ranges_file(tmp_path) -> str:
+    path = tmp_path / "ranges.csv"
+    path.write_text(RANGES_CSV, encoding="utf-8")
+    return str(path)
+
+
+def test_range_database_lookup(ranges_file: str):
+    """Test that ip addresses are matched to ranges covering them."""
+    database = IPRangeDatabase.load(ranges_file)
+
+    assert len(database) == 2
+    assert database.lookup("1.1.1.1")["city"] == "Sydney"
+    assert database.lookup("8.8.8.255")["city"] == "Mountain View"
+    assert database.lookup("8.8.9.0") is None
+    assert database.lookup("0.0.0.1") is None
+
+
+def test_range_database_keeps_zero_coordinates(tmp_path):
+    """Test that ranges on the equator or prime meridian keep their location."""
+    path = tmp_path / "ranges.csv"
+    path.write_text(
+        "ip_start,ip_end,city,latitude,longitude\n8.8.8.0,8.8.8.255,,0,9.5\n",
+        encoding="utf-8",
+    )
+
+    geolocation_response = IPRangeDatabase.load(str(path)).lookup("8.8.8.8")
+
+    assert geolocation_response["latitude"] == 0.0
+    assert geolocation_response["city"] is None
+    assert IPGeolocationCreate(**geolocation_response).latitude == 0.0
+
+
+def test_range_database_rejects_malformed_row(tmp_path):
+    """Test that ranges ending before they start are rejected."""
+    path = tmp_path / "ranges.csv"
+    path.write_text(
+        "ip_start,ip_end,latitude,longitude\n8.8.8.255,8.8.8.0,0,0\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError):
+        IPRangeDatabase.load(str(path))
+
+
+def test_range_database_rejects_overlapping_ranges(tmp_path):
+    """Test that ranges overlapping each other are rejected."""
+    path = tmp_path / "ranges.csv"
+    path.write_text(
+        "ip_start,ip_end,latitude,longitude\n"
+        "8.8.8.0,8.8.8.255,0,0\n"
+        "1.1.1.0,1.1.1.255,0,0\n"
+        "8.8.8.128,8.8.9.0,0,0\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="line 4 overlaps range at line 2"):
+        IPRangeDatabase.load(str(path))
+
+
+@pytest.mark.anyio
+async def test_lookup_reloads_changed_file(ranges_file: str):
+    """Test that changed data file is picked up without restart."""
+    lookup = IPRangeLookup(path=ranges_file, reload_interval=0)
+    assert (await lookup.lookup("8.8.8.8"))["city"] == "Mountain View"
+
+    with open(ranges_file, "w", encoding="utf-8") as file:
+        file.write("ip_start,ip_end,city,latitude,longitude\n")
+        file.write("8.8.8.0,8.8.8.255,Glenmont,40.5,-74.0\n")
+    stat = os.stat(ranges_file)
+    os.utime(ranges_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert (await lookup.lookup("8.8.8.8"))["city"] == "Glenmont"
+    assert await lookup.lookup("1.1.1.1") is None
+
+
+@pytest.mark.anyio
+async def test_lookup_keeps_ranges_when_reload_fails(ranges_file: str):
+    """Test that broken data file does not drop previously loaded ranges."""
+    lookup = IPRangeLookup(path=ranges_file, reload_interval=0)
+    await lookup.lookup("8.8.8.8")
+
+    os.remove(ranges_file)
+
+    assert (await lookup.lookup("8.8.8.8"))["city"] == "Mountain View"
+
+
+@pytest.mark.anyio
+async def test_lookup_keeps_ranges_when_reloaded_ranges_overlap(ranges_file: str):
+    """Test that data file with overlapping ranges does not replace loaded one."""
+    lookup = IPRangeLookup(path=ranges_file, reload_interval=0)
+    await lookup.lookup("8.8.8.8")
+
+    with open(ranges_file, "a", encoding="utf-8") as file:
+        file.write("8.8.0.0,8.8.255.255,US,Glenmont,40.5,-74.0\n")
+    stat = os.stat(ranges_file)
+    os.utime(ranges_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert (await lookup.lookup("8.8.8.8"))["city"] == "Mountain View"
+    assert await lookup.lookup("8.8.4.4") is None
+
+
+@pytest.mark.anyio
+async def test_add_geolocation_resolved_locally(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+    ranges_file: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that geolocation covered by local ranges skips ipstack."""
+    monkeypatch.setattr(ip_range_lookup, "path", ranges_file)
+
+    response = await httpx_async_client.post(
+        app.url_path_for("add_geolocation_to_database"),
+        json={"ip_address": "1.1.1.1"},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json()["ip"] == "1.1.1.1"
+    assert response.json()["city"] == "Sydney"
+
+
+@pytest.mark.anyio
+async def test_bulk_add_geolocations_resolved_locally(
+    app: FastAPI,
+    httpx_async_client: pytest.fixture,
+    mock_ipstack_client_dependency: pytest.fixture,
+    ranges_file: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that only ips not covered by local ranges are sent to ipstack."""
+    monkeypatch.setattr(ip_range_lookup, "path", ranges_file)
+
+    response = await httpx_async_client.post(
+        app.url_path_for("bulk_add_geolocations_to_database"),
+        json={"ip_addresses": ["1.1.1.1", "9.9.9.9"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert [result["status"] for result in response.json()["results"]] == [
+        "created",
+        "created",
+    ]
+    assert response.json()["results"][0]["data"]["city"] == "Sydney"
+    assert mock_ipstack_client_dependency.bulk_requests == [["9.9.9.9"]]
@@ -1,9 +1,12 @@
 """Module containing tests for IpstackClient error handling."""
 
+import anyio
 import pytest
 import httpx
 from fastapi import HTTPException, status
-from app.clients import IpstackClient
+from app.clients import IpstackClient, IpstackThrottle
+from config.settings import settings
+from time import monotonic
 from unittest.mock import AsyncMock
 
 
@@ -48,8 +51,9 @@ async def test_get_geolocation_ipstack_errors(
 
 @pytest.mark.anyio
 async def test_get_geolocation_timeout(mocker):
-    """Test handling of a timeout exception."""
-    mocker.patch.object(
+    """Test handling of a timeout exception, retried before giving up."""
+    mocker.patch.object(settings, "ipstack_retry_backoff", 0)
+    get_mock = mocker.patch.object(
         httpx.AsyncClient,
         "get",
         side_effect=httpx.TimeoutException("Request timed out"),
@@ -61,3 +65,138 @@ async def test_get_geolocation_timeout(mocker):
 
     assert exc_info.value.status_code == status.HTTP_504_GATEWAY_TIMEOUT
     assert "Request timed out" in exc_info.value.detail
+    assert get_mock.call_count == settings.ipstack_max_retries + 1
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_reuses_shared_http_client(mocker):
+    """Test that shared http client is reused and left open on context exit."""
+    mock_response = AsyncMock(spec=httpx.Response)
+    mock_response.json.return_value = {"ip": "8.8.8.8"}
+    mock_response.status_code = 200
+    mock_response.raise_for_status = mocker.Mock()
+    get_mock = mocker.patch.object(httpx.AsyncClient, "get", return_value=mock_response)
+
+    shared_client = httpx.AsyncClient()
+    for _ in range(2):
+        async with IpstackClient(http_client=shared_client) as client:
+            assert client.client is shared_client
+            await client.get_geolocation("8.8.8.8")
+
+    assert get_mock.call_count == 2
+    assert not shared_client.is_closed
+    await shared_client.aclose()
+
+
+@pytest.mark.anyio
+async def test_get_bulk_geolocation(mocker):
+    """Test that bulk lookup sends comma separated ip addresses."""
+    mock_response = AsyncMock(spec=httpx.Response)
+    mock_response.json.return_value = [{"ip": "8.8.8.8"}, {"ip": "8.8.8.7"}]
+    mock_response.status_code = 200
+    mock_response.raise_for_status = mocker.Mock()
+    get_mock = mocker.patch.object(httpx.AsyncClient, "get", return_value=mock_response)
+
+    async with IpstackClient() as client:
+        data = await client.get_bulk_geolocation(["8.8.8.8", "8.8.8.7"])
+
+    assert data == [{"ip": "8.8.8.8"}, {"ip": "8.8.8.7"}]
+    assert "/8.8.8.8,8.8.8.7?access_key=" in get_mock.call_args.args[0]
+
+
+def ipstack_response(status_code: int, data: dict | None = None) -> httpx.Response:
+    """Build ipstack response to a geolocation request."""
+    return httpx.Response(
+        status_code,
+        json=data or {"ip": "8.8.8.8"},
+        request=httpx.Request("GET", "http://api.ipstack.com/8.8.8.8"),
+    )
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_retries_transient_errors(mocker):
+    """Test that connection errors and 5xx responses are retried."""
+    mocker.patch.object(settings, "ipstack_retry_backoff", 0)
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient,
+        "get",
+        side_effect=[
+            httpx.ConnectError("Connection refused"),
+            ipstack_response(status.HTTP_502_BAD_GATEWAY),
+            ipstack_response(status.HTTP_200_OK),
+        ],
+    )
+
+    async with IpstackClient() as client:
+        data = await client.get_geolocation("8.8.8.8")
+
+    assert data == {"ip": "8.8.8.8"}
+    assert get_mock.call_count == 3
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_does_not_retry_client_errors(mocker):
+    """Test that 4xx responses fail without retrying."""
+    mocker.patch.object(settings, "ipstack_retry_backoff", 0)
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient,
+        "get",
+        return_value=ipstack_response(status.HTTP_403_FORBIDDEN),
+    )
+
+    async with IpstackClient() as client:
+        with pytest.raises(HTTPException) as exc_info:
+            await client.get_geolocation("8.8.8.8")
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert get_mock.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_get_geolocation_fails_fast_after_usage_limit(mocker):
+    """Test that requests are not sent while usage limit is exhausted."""
+    get_mock = mocker.patch.object(
+        httpx.AsyncClient,
+        "get",
+        return_value=ipstack_response(
+            status.HTTP_200_OK,
+            {"success": False, "error": {"code": 104, "info": "Limit reached."}},
+        ),
+    )
+    throttle = IpstackThrottle(quota_cooldown=60)
+
+    for _ in range(2):
+        async with IpstackClient(throttle=throttle) as client:
+            with pytest.raises(HTTPException) as exc_info:
+                await client.get_geolocation("8.8.8.8")
+
+    assert exc_info.value.status_code == status.HTTP_402_PAYMENT_REQUIRED
+    assert exc_info.value.headers == {"Retry-After": "60"}
+    assert get_mock.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_throttle_limits_concurrency_and_rate(mocker):
+    """Test that requests wait for a concurrency slot and rate limit token."""
+    in_flight, max_in_flight = 0, 0
+
+    async def get(*args, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await anyio.sleep(0.01)
+        in_flight -= 1
+        return ipstack_response(status.HTTP_200_OK)
+
+    mocker.patch.object(httpx.AsyncClient, "get", side_effect=get)
+    throttle = IpstackThrottle(rate=20, burst=2, max_concurrency=2)
+
+    started_at = monotonic()
+    async with IpstackClient(throttle=throttle) as client:
+        async with anyio.create_task_group() as task_group:
+            for _ in range(6):
+                task_group.start_soon(client.get_geolocation, "8.8.8.8")
+
+    # burst of 2 goes right away, remaining 4 requests are 0.05s apart
+    assert monotonic() - started_at >= 0.2
+    assert max_in_flight == 2
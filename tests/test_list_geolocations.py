@@ -5,6 +5,12 @@ import pytest
 
 from syrupy.assertion import SnapshotAssertion
 
+from app.api.handlers.geolocation.list import paginated_rows_adapter
+from app.cache import geolocation_counter
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationCreate, IPGeolocationInDB
+from config.settings import CountStrategy
+
 
 @pytest.mark.anyio
 async def test_list_existing_geolocations(
@@ -92,3 +98,124 @@ async def test_empty_list_of_geolocations(
     assert response.headers["Content-Type"] == "application/json", (
         f"Response content type: {response.headers['Content-Type']}"
     )
+
+
+@pytest.mark.anyio
+async def test_list_geolocations_with_cursor(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test walking the list of geolocations page by page with a cursor."""
+    url = app.url_path_for("list_all_geolocations_from_database")
+
+    first_page = (await httpx_async_client.get(url, params={"limit": 1})).json()
+    second_page = (
+        await httpx_async_client.get(
+            url, params={"limit": 1, "after": first_page["next_cursor"]}
+        )
+    ).json()
+
+    assert [item["id"] for item in first_page["items"]] == [1]
+    assert [item["id"] for item in second_page["items"]] == [2]
+    assert second_page["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_list_geolocations_with_invalid_cursor(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test retrieving a list of geolocations with malformed cursor."""
+    response = await httpx_async_client.get(
+        app.url_path_for("list_all_geolocations_from_database"),
+        params={"after": "not-a-cursor"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_list_geolocations_with_cursor_and_offset(
+    app: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that cursor and offset pagination cannot be mixed."""
+    response = await httpx_async_client.get(
+        app.url_path_for("list_all_geolocations_from_database"),
+        params={"after": "MQ==", "offset": 1},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+        f"Response status code: {response.status_code}"
+    )
+
+
+@pytest.mark.anyio
+async def test_list_geolocations_without_total(
+    app: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that counting records can be skipped."""
+    response = await httpx_async_client.get(
+        app.url_path_for("list_all_geolocations_from_database"),
+        params={"include_total": False},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.json()["total"] is None
+    assert len(response.json()["items"]) == 1
+
+
+@pytest.mark.anyio
+async def test_count_with_counter_strategy(
+    db_session: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Schema: pytest.fixture,
+    valid_ip1: pytest.fixture,
+):
+    """Test that counter strategy follows creates and deletes without recounting."""
+    repo = IPGeolocationRepository(db=db_session)
+
+    assert await repo.count(strategy=CountStrategy.COUNTER) == 1
+
+    await repo.create(IPGeolocationCreate(**IPGeolocation2_InDB_Schema.model_dump()))
+    await repo.delete(valid_ip1)
+    await repo.delete(valid_ip1)
+
+    assert geolocation_counter.get() == 1
+    assert await repo.count(strategy=CountStrategy.COUNTER) == 1
+    assert await repo.count(strategy=CountStrategy.ESTIMATED) == 1
+
+
+@pytest.mark.anyio
+async def test_list_rows_serialize_like_schema(
+    db_session: pytest.fixture,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    IPGeolocation2_InDB_Model: pytest.fixture,
+):
+    """Test that plain rows are dumped exactly like validated schemas."""
+    repo = IPGeolocationRepository(db=db_session)
+
+    rows = await repo.list_rows()
+    records = [IPGeolocationInDB.model_validate(record) for record in await repo.list()]
+
+    assert [
+        paginated_rows_adapter.dump_python(
+            {
+                "items": [row],
+                "total": None,
+                "offset": 0,
+                "limit": 1,
+                "next_cursor": None,
+            },
+            mode="json",
+        )["items"][0]
+        for row in rows
+    ] == [record.model_dump(mode="json") for record in records]
@@ -0,0 +1,45 @@
+"""Module containing tests for logging configuration."""
+
+from loguru import logger
+
+from app.logging_config import RateLimitFilter
+
+
+def log_flood():
+    logger.warning("flood")
+
+
+def test_rate_limit_filter_samples_per_call_site(mocker):
+    """Test that records over the rate are dropped per call site and reported."""
+    monotonic = mocker.patch("app.logging_config.monotonic", return_value=100.0)
+    records = []
+    handler_id = logger.add(
+        lambda message: records.append(message.record),
+        filter=RateLimitFilter(rate=2),
+        format="{message}",
+    )
+    try:
+        for _ in range(5):
+            log_flood()
+        logger.warning("other message type")
+        logger.critical("always logged")
+        logger.critical("always logged")
+
+        monotonic.return_value = 101.0
+        for _ in range(2):
+            log_flood()
+    finally:
+        logger.remove(handler_id)
+
+    messages = [record["message"] for record in records]
+    assert messages == [
+        "flood",
+        "flood",
+        "other message type",
+        "always logged",
+        "always logged",
+        "flood",
+        "flood",
+    ]
+    assert records[-2]["extra"]["sampled_out"] == 3
+    assert "sampled_out" not in records[-1]["extra"]
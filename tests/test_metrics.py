@@ -0,0 +1,75 @@
+"""Module containing tests for the metrics endpoint and metric types."""
+
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy import create_engine, text
+
+from app.metrics import (
+    Histogram,
+    db_statement_duration,
+    http_request_duration,
+    instrument_engine,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are rendered cumulatively with sum and count."""
+    histogram = Histogram("test_seconds", "Test.", labels=("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 2',
+        'test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_seconds_sum{route="/a"} 5.55',
+        'test_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_engine_statements_are_timed():
+    """Test that statements of instrumented engine are timed by operation."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    db_statement_duration.clear()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(Exception):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info["statement_started_at"] == []
+
+    assert 'db_statement_duration_seconds_count{operation="SELECT"} 1' in (
+        db_statement_duration.render()
+    )
+
+
+@pytest.mark.anyio
+async def test_metrics(
+    app: FastAPI,
+    IPGeolocation1_InDB_Model: pytest.fixture,
+    valid_ip1: pytest.fixture,
+    httpx_async_client: pytest.fixture,
+):
+    """Test that requests are timed per route template and metrics are exposed."""
+    http_request_duration.clear()
+    await httpx_async_client.get(
+        app.url_path_for("get_geolocation_from_database"),
+        params={"ip_address": valid_ip1},
+    )
+
+    response = await httpx_async_client.get(app.url_path_for("metrics"))
+
+    assert response.status_code == status.HTTP_200_OK, (
+        f"Response status code: {response.status_code}"
+    )
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/geolocation",'
+        'status="200"} 1'
+    ) in response.text
+    assert 'cache_hit_ratio{cache="geolocation"}' in response.text
+    assert 'db_pool_connections{state="checked_out"}' in response.text
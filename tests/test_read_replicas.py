@@ -0,0 +1,148 @@
+"""Module containing tests for routing database reads to replicas."""
+
+from pathlib import Path
+
+import pytest
+
+from app.db.db_session import DatabaseSessionManager
+from app.db.models.base import Base
+from app.db.repositories.geolocation import IPGeolocationRepository
+from app.models.models import IPGeolocationCreate
+from config.settings import ReplicaSelection, Settings
+
+
+async def create_databases(
+    tmp_path: Path, replicas: int = 1, **kwargs
+) -> DatabaseSessionManager:
+    """Create primary and replica stand-ins as separate sqlite files."""
+    urls = [
+        f"sqlite+aiosqlite:///{tmp_path / f'database{index}.sqlite'}"
+        for index in range(replicas + 1)
+    ]
+    manager = DatabaseSessionManager(urls[0], replica_hosts=urls[1:], **kwargs)
+    for engine in (manager._engine, *manager._replica_engines):
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_reads_are_routed_to_replica(
+    tmp_path: Path, IPGeolocation1_InDB_Schema: pytest.fixture, valid_ip1: str
+):
+    """Test that writes go to primary and marked reads to replica."""
+    manager = await create_databases(tmp_path)
+    try:
+        async with manager.session() as session:
+            repo = IPGeolocationRepository(db=session)
+            await repo.upsert(
+                IPGeolocationCreate(**IPGeolocation1_InDB_Schema.model_dump())
+            )
+
+            # no read-your-writes window, reads hit the lagging replica
+            assert manager.router.pinned is False
+            assert await repo.exact_count() == 0
+            assert await repo.get_by_ip(valid_ip1) is None
+
+        async with manager._engine.connect() as connection:
+            assert (
+                await connection.exec_driver_sql("SELECT count(*) FROM ipgeolocation")
+            ).scalar() == 1
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_of_written_ips_use_primary(
+    tmp_path: Path,
+    IPGeolocation1_InDB_Schema: pytest.fixture,
+    IPGeolocation2_InDB_Schema: pytest.fixture,
+    valid_ip1: str,
+    valid_ip2: str,
+):
+    """Test that only reads of freshly written ips are pinned to the primary."""
+    manager = await create_databases(tmp_path, read_your_writes_window=60)
+    try:
+        async with manager.session() as session:
+            repo = IPGeolocationRepository(db=session)
+            await repo.create_many(
+                [
+                    IPGeolocationCreate(**IPGeolocation1_InDB_Schema.model_dump()),
+                    IPGeolocationCreate(**IPGeolocation2_InDB_Schema.model_dump()),
+                ]
+            )
+            await repo.delete(valid_ip2)
+
+            assert manager.router.pinned is False
+            assert await repo.get_by_ip(valid_ip1) is not None
+            assert [record.ip for record in await repo.get_many_by_ip([valid_ip1])] == [
+                valid_ip1
+            ]
+            # unrelated reads still hit the lagging replica
+            assert await repo.exact_count() == 0
+            assert await repo.get_many_by_ip(["10.0.0.1"]) == []
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_in_transaction_use_primary(
+    tmp_path: Path, IPGeolocation1_InDB_Schema: pytest.fixture
+):
+    """Test that reads following an uncommitted write see it."""
+    manager = await create_databases(tmp_path, read_your_writes_window=60)
+    try:
+        async with manager.session() as session:
+            repo = IPGeolocationRepository(db=session)
+            await session.execute(
+                repo.insert().values(
+                    **repo._with_derived_values(
+                        IPGeolocation1_InDB_Schema.model_dump(exclude={"id"})
+                    )
+                )
+            )
+
+            # uncommitted write is visible only on the primary
+            assert await repo.exact_count() == 1
+            await session.rollback()
+            assert await repo.exact_count() == 0
+            assert manager.router.pinned is False
+
+            manager.router.pin()
+            assert await repo.get_by_ip("10.0.0.1") is None
+            assert manager.router.read_engine() is manager._engine
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_replica_selection(tmp_path: Path):
+    """Test that replicas take turns or the least busy one is picked."""
+    manager = await create_databases(tmp_path, replicas=2)
+    first, second = manager._replica_engines
+    try:
+        assert [manager.router.read_engine() for _ in range(4)] == [
+            first,
+            second,
+            first,
+            second,
+        ]
+
+        manager.router.selection = ReplicaSelection.LEAST_BUSY
+        async with first.connect():
+            assert manager.router.read_engine() is second
+        async with second.connect():
+            assert manager.router.read_engine() is first
+    finally:
+        await manager.close()
+
+
+def test_replica_urls_settings():
+    """Test that replica hosts are turned into urls of the primary database."""
+    replicated = Settings(DB_REPLICA_HOSTS="replica1, replica2:6432", DB_PORT=5433)
+
+    assert Settings(DB_REPLICA_HOSTS="").database_replica_urls == []
+    assert [url.split("@")[1] for url in replicated.database_replica_urls] == [
+        f"replica1:5433/{replicated.db_name}",
+        f"replica2:6432/{replicated.db_name}",
+    ]
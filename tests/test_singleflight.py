@@ -0,0 +1,72 @@
+"""Module containing tests for single-flight call coalescing."""
+
+import anyio
+import pytest
+
+from app.concurrency import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_for_same_key_are_coalesced():
+    """Test that concurrent callers of one key share a single execution."""
+    single_flight = SingleFlight()
+    calls = 0
+    results = []
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await anyio.sleep(0.01)
+        return calls
+
+    async def caller():
+        results.append(await single_flight.do("8.8.8.8", lookup))
+
+    async with anyio.create_task_group() as task_group:
+        for _ in range(10):
+            task_group.start_soon(caller)
+
+    assert calls == 1
+    assert results == [1] * 10
+    assert not single_flight.in_flight("8.8.8.8")
+
+
+@pytest.mark.anyio
+async def test_different_keys_are_not_coalesced():
+    """Test that callers of different keys run independently."""
+    single_flight = SingleFlight()
+    calls = []
+
+    async def lookup(key):
+        calls.append(key)
+        await anyio.sleep(0.01)
+        return key
+
+    async with anyio.create_task_group() as task_group:
+        for key in ("8.8.8.8", "8.8.8.7"):
+            task_group.start_soon(single_flight.do, key, lambda key=key: lookup(key))
+
+    assert sorted(calls) == ["8.8.8.7", "8.8.8.8"]
+
+
+@pytest.mark.anyio
+async def test_error_is_shared_with_waiting_callers():
+    """Test that waiting callers receive the exception raised by the leader."""
+    single_flight = SingleFlight()
+    errors = []
+
+    async def failing_lookup():
+        await anyio.sleep(0.01)
+        raise ValueError("ipstack unavailable")
+
+    async def caller():
+        try:
+            await single_flight.do("8.8.8.8", failing_lookup)
+        except ValueError as e:
+            errors.append(str(e))
+
+    async with anyio.create_task_group() as task_group:
+        for _ in range(3):
+            task_group.start_soon(caller)
+
+    assert errors == ["ipstack unavailable"] * 3
@@ -26,3 +26,69 @@ async def test_delete_geolocation_url(app: FastAPI):
 async def test_list_geolocations_url(app: FastAPI):
     url = app.url_path_for("list_all_geolocations_from_database")
     assert url == "/api/geolocation/list"
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_geolocations_url(app: FastAPI):
+    url = app.url_path_for("bulk_add_geolocations_to_database")
+    assert url == "/api/geolocation/bulk"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocations_batch_url(app: FastAPI):
+    url = app.url_path_for("get_geolocations_batch_from_database")
+    assert url == "/api/geolocation/batch"
+
+
+@pytest.mark.asyncio
+async def test_export_geolocations_url(app: FastAPI):
+    url = app.url_path_for("export_geolocations_from_database")
+    assert url == "/api/geolocation/export"
+
+
+@pytest.mark.asyncio
+async def test_import_geolocations_url(app: FastAPI):
+    url = app.url_path_for("import_geolocations_to_database")
+    assert url == "/api/admin/geolocation/import"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocations_range_url(app: FastAPI):
+    url = app.url_path_for("get_geolocations_range_from_database")
+    assert url == "/api/geolocation/range"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocations_nearby_url(app: FastAPI):
+    url = app.url_path_for("get_geolocations_nearby_from_database")
+    assert url == "/api/geolocation/nearby"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocations_in_box_url(app: FastAPI):
+    url = app.url_path_for("get_geolocations_in_box_from_database")
+    assert url == "/api/geolocation/box"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocation_aggregates_url(app: FastAPI):
+    url = app.url_path_for("get_geolocation_aggregates_from_database")
+    assert url == "/api/geolocation/aggregates"
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_url(app: FastAPI):
+    url = app.url_path_for("pool_stats")
+    assert url == "/api/maintenance/pool"
+
+
+@pytest.mark.asyncio
+async def test_metrics_url(app: FastAPI):
+    url = app.url_path_for("metrics")
+    assert url == "/api/maintenance/metrics"
+
+
+@pytest.mark.asyncio
+async def test_get_geolocation_job_url(app: FastAPI):
+    url = app.url_path_for("get_geolocation_job", job_id="abc")
+    assert url == "/api/geolocation/jobs/abc"